@@ -1,21 +1,155 @@
 import os
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from backend.file_handler import handle_upload, cleanup_temp_dir
-from backend.code_checker import ROSCodeChecker
-from backend.simulation_runner import SimulationRunner
-from backend.reports import generate_text_report, generate_json_report
+import math
+import re
+import time
+import json
+import shutil
+import tempfile
+import threading
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_from_directory
+from backend.file_handler import (handle_upload, handle_workspace_upload, iter_workspace_upload,
+                                  cleanup_temp_dir, UploadRejected)
+from backend.code_checker import ROSCodeChecker, check_cache_key
+from backend.workspace_checker import check_workspace, workspace_cache_key
+from backend.project_state import ProjectState, check_workspace_incremental
+from backend.result_cache import ResultCache, content_hash
+from backend.job_queue import JobQueue, QueueFullError
+from backend.results_store import ResultsStore
+from backend.reports import generate_text_report, iter_report, REPORT_FORMATS
+from backend.metrics import metrics, summarize
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
+app.config['CHECK_WORKERS'] = int(os.environ.get('CHECK_WORKERS', 0)) or None  # None = one per CPU
+
+app.config['CACHE_DIR'] = os.environ.get('CACHE_DIR', os.path.join(app.config['UPLOAD_FOLDER'], 'cache'))
+app.config['CACHE_MEMORY_ITEMS'] = int(os.environ.get('CACHE_MEMORY_ITEMS', 256))
+app.config['CACHE_DISK_BYTES'] = int(os.environ.get('CACHE_DISK_BYTES', 256 * 1024 * 1024))
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 4))
+app.config['JOB_QUEUE_SIZE'] = int(os.environ.get('JOB_QUEUE_SIZE', 32))
+app.config['MONTE_CARLO_MAX_SCENARIOS'] = int(os.environ.get('MONTE_CARLO_MAX_SCENARIOS', 100000))
+app.config['MAX_ANIMATION_FRAMES'] = int(os.environ.get('MAX_ANIMATION_FRAMES', 500))
+app.config['TRAJECTORY_MAX_STEPS'] = int(os.environ.get('TRAJECTORY_MAX_STEPS', 100000))
+app.config['FRAMES_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'frames')
+app.config['ZIP_MAX_TOTAL_SIZE'] = int(os.environ.get('ZIP_MAX_TOTAL_SIZE', 64 * 1024 * 1024))
+app.config['ZIP_MAX_ENTRIES'] = int(os.environ.get('ZIP_MAX_ENTRIES', 10000))
+app.config['ZIP_MAX_ENTRY_SIZE'] = int(os.environ.get('ZIP_MAX_ENTRY_SIZE', 8 * 1024 * 1024))
+app.config['RESULTS_DB'] = os.environ.get('RESULTS_DB', os.path.join(app.config['UPLOAD_FOLDER'], 'results.db'))
+app.config['RESULTS_TTL'] = float(os.environ.get('RESULTS_TTL', 7 * 24 * 3600))  # Seconds
+app.config['RESULTS_PAGE_SIZE'] = int(os.environ.get('RESULTS_PAGE_SIZE', 50))  # Files per report page
+app.config['STREAM_MAX_STEPS'] = int(os.environ.get('STREAM_MAX_STEPS', 100000))
+app.config['ROBOT_MODEL'] = os.environ.get('ROBOT_MODEL') or None  # URDF or DH .json; None = built-in planar arm
+
+FRAME_SET_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+PROJECT_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,128}$')
+MONTE_CARLO_MAX_WORST_CASES = 100
+JOB_POLL_INTERVAL = 0.25  # Seconds between store reads when streaming another process's job
+JOB_PUBLISH_INTERVAL = 0.25  # Minimum seconds between stored progress updates of a running job
 
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Check and simulation results keyed by file contents, shared across uploads
+result_cache = ResultCache(app.config['CACHE_DIR'],
+                           max_memory_items=app.config['CACHE_MEMORY_ITEMS'],
+                           max_disk_bytes=app.config['CACHE_DISK_BYTES'])
+
+# Last check of each named project, for incremental workspace re-checks
+project_state = ProjectState(result_cache)
+
+def _remove_result_frames(result_ids):
+    """Delete the frame sets that belong to expired results only"""
+    for result_id in result_ids:
+        for frame_set in (result_id, f"{result_id}-trajectory"):
+            shutil.rmtree(_frame_dir(frame_set), ignore_errors=True)
+
+# Check and simulation reports per upload, expired after RESULTS_TTL
+results_store = ResultsStore(app.config['RESULTS_DB'], ttl_seconds=app.config['RESULTS_TTL'],
+                             on_expire=_remove_result_frames)
+
+_published_jobs = {}  # job_id -> (status, time) last stored, for jobs still running
+_published_jobs_lock = threading.Lock()
+
+def _publish_job(job):
+    """Store a job's state so any server process can answer status requests for it
+
+    Status changes are always stored; progress updates at most every JOB_PUBLISH_INTERVAL.
+    """
+    now = time.monotonic()
+    with _published_jobs_lock:
+        last = _published_jobs.get(job.id)
+        if last is not None and last[0] == job.status and now - last[1] < JOB_PUBLISH_INTERVAL:
+            return
+        if job.finished:
+            _published_jobs.pop(job.id, None)
+        else:
+            _published_jobs[job.id] = (job.status, now)
+    results_store.save_job(job.id, job.version, job.to_dict(include_result=job.finished))
+
+# Background workers for ?async=1 uploads and simulations; each server process runs its own
+job_queue = JobQueue(workers=app.config['JOB_WORKERS'], max_queue=app.config['JOB_QUEUE_SIZE'],
+                     on_change=_publish_job)
+
+metrics.gauge('job_queue_depth', "Jobs waiting for a background worker", job_queue.depth)
+metrics.gauge('jobs_running', "Jobs being run by background workers", job_queue.running)
+metrics.gauge('cache_hits_total', "Result cache lookups served from the cache", lambda: result_cache.hits, 'counter')
+metrics.gauge('cache_misses_total', "Result cache lookups that missed", lambda: result_cache.misses, 'counter')
+metrics.gauge('cache_hit_ratio', "Share of result cache lookups served from the cache",
+              lambda: result_cache.hits / max(1, result_cache.hits + result_cache.misses))
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def _no_progress(progress, message=''):
+    pass
+
+def _wants_async() -> bool:
+    """Whether the client asked for a background job instead of waiting for the result"""
+    return request.args.get('async', request.form.get('async', '')).lower() in ('1', 'true', 'yes')
+
+def _wants_profile() -> bool:
+    """Whether the client asked for a per-stage timing breakdown with the result"""
+    return request.args.get('profile', request.form.get('profile', '')).lower() in ('1', 'true', 'yes')
+
+def _profiled(fn):
+    """Wrap fn so its result also carries the time it spent per stage, as its profile"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        with metrics.profile() as timings:
+            result = fn(*args, **kwargs)
+        result["profile"] = summarize(timings)
+        result["profile"]["total_seconds"] = round(time.perf_counter() - start, 6)
+        return result
+    return wrapper
+
+def _run(kind, fn, *args, on_reject=None):
+    """Run fn now, or as a background job if the client asked for ?async=1"""
+    if _wants_profile():
+        fn = _profiled(fn)
+    if _wants_async():
+        return _submit_job(kind, fn, *args, on_reject=on_reject)
+    return jsonify(fn(*args))
+
+def _submit_job(kind, fn, *args, on_reject=None):
+    """Queue fn on the background workers and return 202 with the job id (429 when full)"""
+    try:
+        job = job_queue.submit(fn, *args, kind=kind)
+    except QueueFullError as e:
+        if on_reject:
+            on_reject()
+        response = jsonify({"error": str(e)})
+        response.status_code = 429
+        response.headers['Retry-After'] = '5'
+        return response
+    
+    return jsonify({
+        "job_id": job.id,
+        "status_url": url_for('job_status', job_id=job.id),
+        "stream_url": url_for('job_stream', job_id=job.id)
+    }), 202
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     if 'file' not in request.files:
@@ -25,105 +159,466 @@ def upload_file():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
     
-    # Handle file upload
-    file_path, temp_dir = handle_upload(file)
-    
-    # Check the code
-    checker = ROSCodeChecker()
-    check_report = checker.check_file(file_path)
+    is_workspace = file.filename.endswith('.zip')
+    project = request.args.get('project', request.form.get('project')) or None
+    if project is not None and not PROJECT_PATTERN.match(project):
+        return jsonify({"error": "project must be 1-128 letters, digits, '.', '_' or '-'"}), 400
     
-    # Generate reports
-    text_report = generate_text_report(check_report)
-    json_report = generate_json_report(check_report)
+    try:
+        if is_workspace and not _wants_async():
+            # Stream archive entries straight into the checker as they are extracted
+            temp_dir = tempfile.mkdtemp()
+            file_paths = iter_workspace_upload(file, temp_dir, **_zip_limits())
+            return _run('check', _check_upload, file_paths, temp_dir, is_workspace, project)
+        
+        # Save the upload in the request thread; checking can happen in the background
+        if is_workspace:
+            file_paths, temp_dir = handle_workspace_upload(file, **_zip_limits())
+        else:
+            file_path, temp_dir = handle_upload(file)
+            file_paths = [file_path]
+    except UploadRejected as e:
+        return jsonify({"error": str(e)}), e.status_code
     
-    # Store results in session or database (simplified: store in temp files)
-    result_id = os.path.basename(temp_dir)
-    
-    with open(os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_check.json"), 'w') as f:
-        f.write(json_report)
-    
-    with open(os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_report.txt"), 'w') as f:
-        f.write(text_report)
-    
-    # Clean up temp directory but keep the main file
-    cleanup_temp_dir(temp_dir)
+    return _run('check', _check_upload, file_paths, temp_dir, is_workspace, project,
+                on_reject=lambda: cleanup_temp_dir(temp_dir))
+
+def _zip_limits():
+    return {
+        "max_total_size": app.config['ZIP_MAX_TOTAL_SIZE'],
+        "max_entries": app.config['ZIP_MAX_ENTRIES'],
+        "max_entry_size": app.config['ZIP_MAX_ENTRY_SIZE']
+    }
+
+def _check_upload(file_paths, temp_dir, is_workspace, project=None, progress=_no_progress):
+    """Check saved upload files, store the reports and return the response payload"""
+    try:
+        if is_workspace:
+            # Workspace mode: check every source file in the package concurrently;
+            # unchanged files are served from the per-file cache
+            checked = []
+            total = len(file_paths) if isinstance(file_paths, list) else None
+            
+            def on_report(path, report):
+                checked.append(path)
+                if total:
+                    progress(0.9 * len(checked) / total, f"Checked {len(checked)}/{total} files")
+                else:
+                    progress(0.0, f"Checked {len(checked)} files")
+            
+            with metrics.stage('check.workspace'):
+                if project:
+                    # Incremental mode: only files changed since the project's last check are analyzed
+                    check_report = check_workspace_incremental(file_paths, temp_dir, project, project_state,
+                                                               app.config['CHECK_WORKERS'], result_cache, on_report)
+                else:
+                    check_report = check_workspace(file_paths, temp_dir, app.config['CHECK_WORKERS'],
+                                                   result_cache, on_report)
+            cache_key = workspace_cache_key(checked, temp_dir)
+        else:
+            file_path = file_paths[0]
+            cache_key = check_cache_key(file_path)
+            check_report = result_cache.get(cache_key)
+            
+            # Check the code
+            if check_report is None:
+                progress(0.1, "Checking code")
+                checker = ROSCodeChecker()
+                with metrics.stage('check.file'):
+                    check_report = checker.check_file(file_path)
+                result_cache.set(cache_key, check_report)
+        
+        # Store results; text reports are rendered from them when viewed
+        progress(0.95, "Storing results")
+        result_id = os.path.basename(temp_dir)
+        with metrics.stage('results.store'):
+            results_store.save_check(result_id, check_report, file_hash=cache_key)
+    finally:
+        # Clean up temp directory but keep the main file
+        cleanup_temp_dir(temp_dir)
     
-    return jsonify({
+    return {
         "result_id": result_id,
         "check_report": check_report,
-        "text_report": text_report
+        "text_report": generate_text_report(check_report)
+    }
+
+@app.route('/results')
+def list_results():
+    """List stored results, filtered by file_hash or a since/until timestamp range"""
+    try:
+        since = float(request.args['since']) if 'since' in request.args else None
+        until = float(request.args['until']) if 'until' in request.args else None
+        limit = min(int(request.args.get('limit', 100)), 1000)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({"error": "since, until, limit and offset must be numbers"}), 400
+    
+    summaries = results_store.summaries(request.args.get('file_hash') or None, since, until, limit, offset)
+    return jsonify({
+        "results": summaries,
+        "next_offset": offset + len(summaries) if len(summaries) == limit else None
     })
 
+def _report_page(result_id):
+    """The stored result holding one page of its workspace files, with pagination details"""
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', app.config['RESULTS_PAGE_SIZE']))
+    except ValueError:
+        raise ValueError("page and per_page must be numbers")
+    if page < 1 or not 1 <= per_page <= 1000:
+        raise ValueError("page must be at least 1 and per_page between 1 and 1000")
+    
+    record = results_store.get_page(result_id, (page - 1) * per_page, per_page)
+    if record is None:
+        return None, None
+    pages = max(1, -(-record["file_count"] // per_page))
+    if page > pages:
+        raise ValueError(f"page must be at most {pages}")
+    pagination = {
+        "page": page,
+        "pages": pages,
+        "per_page": per_page,
+        "file_count": record["file_count"],
+        "first_file": min((page - 1) * per_page + 1, record["file_count"]),
+        "last_file": min(page * per_page, record["file_count"])
+    }
+    return record, pagination
+
 @app.route('/results/<result_id>')
 def show_results(result_id):
-    # Load check report
-    check_report_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_check.json")
-    if not os.path.exists(check_report_path):
+    try:
+        record, pagination = _report_page(result_id)
+    except ValueError as e:
+        return str(e), 400
+    if record is None:
         return "Result not found", 404
     
-    with open(check_report_path, 'r') as f:
-        check_report = json.load(f)
-    
-    # Load text report
-    report_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_report.txt")
-    with open(report_path, 'r') as f:
-        text_report = f.read()
-    
     return render_template('results.html', 
                           result_id=result_id,
-                          check_report=check_report["check_report"],
-                          text_report=text_report)
+                          check_report=record["check_report"],
+                          pagination=pagination,
+                          text_report=generate_text_report(record["check_report"], file_count=record["file_count"]))
+
+@app.route('/results/<result_id>/report')
+def download_report(result_id):
+    """Stream a stored report as text, compact JSON, JSON lines or msgpack (?format=)"""
+    record = results_store.get(result_id)
+    if record is None:
+        return jsonify({"error": "Result not found"}), 404
+    
+    fmt = request.args.get('format', 'json')
+    try:
+        chunks = iter_report(record["check_report"], record["simulation_report"], fmt, record["file_hash"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(chunks, content_type=REPORT_FORMATS[fmt])
 
 @app.route('/simulate/<result_id>', methods=['POST'])
 def run_simulation(result_id):
     # Load check report
-    check_report_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_check.json")
-    if not os.path.exists(check_report_path):
+    if not results_store.exists(result_id):
+        return jsonify({"error": "Result not found"}), 404
+    
+    return _run('simulation', _simulate, result_id)
+
+def _robot_model():
+    """The configured robot model, loaded on first use and whenever its file changes"""
+    if not app.config['ROBOT_MODEL']:
+        return None
+    from backend.kinematics import load_model
+    return load_model(app.config['ROBOT_MODEL'])
+
+def _simulate(result_id, progress=_no_progress):
+    """Simulate a checked upload, store the reports and return the response payload"""
+    # Imported on first use: the simulation pulls in NumPy and matplotlib, which checks never need
+    from backend.simulation_runner import SimulationRunner, SIMULATION_VERSION
+    record = results_store.get(result_id)
+    if record is None:
+        raise LookupError(f"Result {result_id} has expired")
+    model = _robot_model()
+    
+    # Run simulation, reusing the output for previously simulated file contents
+    sim_cache_key = None
+    sim_report = None
+    if record["file_hash"]:
+        sim_cache_key = content_hash('simulation', SIMULATION_VERSION, model.fingerprint if model else '',
+                                     record["file_hash"])
+        sim_report = result_cache.get(sim_cache_key)
+    
+    # Frames belong to the result, so they expire with it; a cache hit links the cached
+    # report's frames in, and simulates again if that result has already expired
+    frame_set = result_id
+    if sim_report is not None and not _link_frames(sim_report, frame_set):
+        sim_report = None
+    
+    if sim_report is None:
+        progress(0.1, "Running simulation")
+        simulator = SimulationRunner(frame_dir=_frame_dir(frame_set), model=model)
+        with metrics.stage('simulate.run'):
+            sim_report = simulator.run_simulation("", record["check_report"])  # File path not needed for simplified version
+        sim_report["frame_set"] = frame_set
+        if sim_cache_key:
+            result_cache.set(sim_cache_key, sim_report)
+    
+    progress(0.9, "Generating reports")
+    return _store_simulation(result_id, record["check_report"], sim_report)
+
+@app.route('/simulate/<result_id>/trajectory', methods=['POST'])
+def run_trajectory(result_id):
+    """Simulate the full time-stepped motion instead of only the final pose"""
+    record = results_store.get(result_id)
+    if record is None:
+        return jsonify({"error": "Result not found"}), 404
+    
+    params = request.get_json(silent=True) or {}
+    try:
+        options = {
+            "control_rate": float(params.get('control_rate', 100.0)),
+            "max_joint_velocity": float(params.get('max_joint_velocity', 1.0)),
+            "max_output_steps": int(params.get('max_output_steps', 1000)),
+            "animation_frames": int(params.get('animation_frames', 0)),
+            "animation_fps": float(params.get('animation_fps', 20.0))
+        }
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid trajectory parameters"}), 400
+    rates = (options["control_rate"], options["max_joint_velocity"], options["animation_fps"])
+    if not all(math.isfinite(rate) and rate > 0 for rate in rates):
+        return jsonify({"error": "control_rate, max_joint_velocity and animation_fps must be positive and finite"}), 400
+    if not 0 <= options["animation_frames"] <= app.config['MAX_ANIMATION_FRAMES']:
+        return jsonify({"error": f"animation_frames must be between 0 and {app.config['MAX_ANIMATION_FRAMES']}"}), 400
+    if options["max_output_steps"] < 0:
+        return jsonify({"error": "max_output_steps must not be negative"}), 400
+    
+    # Check the length of the motion now, so an oversized request fails here and not in a job
+    from backend.simulation_runner import SimulationRunner
+    steps = SimulationRunner().trajectory_steps("", record["check_report"], options["control_rate"],
+                                                options["max_joint_velocity"])
+    if steps > app.config['TRAJECTORY_MAX_STEPS']:
+        return jsonify({"error": f"The motion takes {steps:.3g} steps at this control_rate; "
+                                 f"the limit is {app.config['TRAJECTORY_MAX_STEPS']}"}), 400
+    
+    return _run('trajectory', _simulate_trajectory, result_id, options)
+
+def _simulate_trajectory(result_id, options, progress=_no_progress):
+    """Run a trajectory simulation, store the reports and return the response payload"""
+    from backend.simulation_runner import SimulationRunner
+    record = results_store.get(result_id)
+    if record is None:
+        raise LookupError(f"Result {result_id} has expired")
+    
+    progress(0.1, "Simulating trajectory")
+    frame_set = f"{result_id}-trajectory"
+    simulator = SimulationRunner(frame_dir=_frame_dir(frame_set), model=_robot_model())
+    with metrics.stage('simulate.trajectory'):
+        sim_report = simulator.run_trajectory("", record["check_report"], max_steps=app.config['TRAJECTORY_MAX_STEPS'],
+                                              **options)
+    sim_report["frame_set"] = frame_set
+    
+    progress(0.9, "Generating reports")
+    return _store_simulation(result_id, record["check_report"], sim_report)
+
+@app.route('/simulate/<result_id>/stream')
+def stream_simulation(result_id):
+    """Stream a trajectory simulation as Server-Sent Events while it is being computed"""
+    record = results_store.get(result_id)
+    if record is None:
         return jsonify({"error": "Result not found"}), 404
     
-    with open(check_report_path, 'r') as f:
-        check_report = json.load(f)
+    try:
+        options = {
+            "control_rate": float(request.args.get('control_rate', 100.0)),
+            "max_joint_velocity": float(request.args.get('max_joint_velocity', 1.0)),
+            "chunk_steps": int(request.args.get('chunk_steps', 50)),
+            "frame_every": int(request.args.get('frame_every', 0))
+        }
+    except ValueError:
+        return jsonify({"error": "Invalid stream parameters"}), 400
     
-    # Run simulation
-    simulator = SimulationRunner()
-    sim_report = simulator.run_simulation("", check_report["check_report"])  # File path not needed for simplified version
+    from backend.simulation_runner import SimulationRunner
+    try:
+        events = SimulationRunner(model=_robot_model()).stream_trajectory(
+            "", record["check_report"], max_steps=app.config['STREAM_MAX_STEPS'], **options)
+        start = next(events)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if options["frame_every"] and start["steps"] / options["frame_every"] > app.config['MAX_ANIMATION_FRAMES']:
+        return jsonify({"error": f"frame_every is too small: at most {app.config['MAX_ANIMATION_FRAMES']} frames"}), 400
     
-    # Update reports with simulation results
-    text_report = generate_text_report(check_report["check_report"], sim_report)
-    json_report = generate_json_report(check_report["check_report"], sim_report)
+    def stream():
+        yield f"data: {json.dumps(start)}\n\n"
+        try:
+            for event in events:
+                yield f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
     
-    # Save updated reports
-    with open(os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_sim.json"), 'w') as f:
-        f.write(json_report)
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/simulate/<result_id>/monte_carlo', methods=['POST'])
+def run_monte_carlo(result_id):
+    """Evaluate the motion over many randomly perturbed scenarios"""
+    if not results_store.exists(result_id):
+        return jsonify({"error": "Result not found"}), 404
     
-    with open(os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_sim_report.txt"), 'w') as f:
-        f.write(text_report)
+    params = request.get_json(silent=True) or {}
+    try:
+        options = {
+            "scenarios": int(params.get('scenarios', 1000)),
+            "cube_noise": float(params.get('cube_noise', 0.02)),
+            "link_noise": float(params.get('link_noise', 0.05)),
+            "joint_noise": float(params.get('joint_noise', 0.02)),
+            "seed": int(params['seed']) if params.get('seed') is not None else None,
+            "worst_cases": int(params.get('worst_cases', 5))
+        }
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid Monte Carlo parameters"}), 400
+    if not 1 <= options["scenarios"] <= app.config['MONTE_CARLO_MAX_SCENARIOS']:
+        return jsonify({"error": f"scenarios must be between 1 and {app.config['MONTE_CARLO_MAX_SCENARIOS']}"}), 400
+    noise = (options["cube_noise"], options["link_noise"], options["joint_noise"])
+    if not all(math.isfinite(level) and level >= 0 for level in noise):
+        return jsonify({"error": "Noise levels must be finite and not negative"}), 400
+    if not 0 <= options["worst_cases"] <= MONTE_CARLO_MAX_WORST_CASES:
+        return jsonify({"error": f"worst_cases must be between 0 and {MONTE_CARLO_MAX_WORST_CASES}"}), 400
     
-    return jsonify({
+    return _run('monte_carlo', _simulate_monte_carlo, result_id, options)
+
+def _simulate_monte_carlo(result_id, options, progress=_no_progress):
+    """Run a Monte Carlo robustness sweep and return the response payload"""
+    from backend.simulation_runner import SimulationRunner
+    record = results_store.get(result_id)
+    if record is None:
+        raise LookupError(f"Result {result_id} has expired")
+    
+    progress(0.1, f"Simulating {options['scenarios']} scenarios")
+    simulator = SimulationRunner(model=_robot_model())
+    with metrics.stage('simulate.monte_carlo'):
+        monte_carlo = simulator.run_monte_carlo("", record["check_report"], **options)
+    
+    return {
+        "success": True,
+        "result_id": result_id,
+        "monte_carlo": monte_carlo
+    }
+
+def _store_simulation(result_id, check_report, sim_report):
+    """Save the simulation report for a result and return the response payload"""
+    with metrics.stage('results.store'):
+        results_store.save_simulation(result_id, sim_report)
+    
+    return {
         "success": True,
+        "result_id": result_id,
         "sim_report": sim_report,
-        "text_report": text_report
-    })
+        "text_report": generate_text_report(check_report, sim_report)
+    }
+
+def _frame_dir(frame_set):
+    return os.path.join(app.config['FRAMES_FOLDER'], frame_set)
+
+def _link_frames(sim_report, frame_set):
+    """Point a cached simulation report at frame_set, hard-linking its frame files there
+
+    Returns False if the frames are gone, i.e. the result they belonged to has expired.
+    """
+    source = _frame_dir(sim_report.get("frame_set") or frame_set)
+    target = _frame_dir(frame_set)
+    try:
+        os.makedirs(target, exist_ok=True)
+        for name in sim_report["frames"]:
+            destination = os.path.join(target, name)
+            if not os.path.exists(destination):
+                try:
+                    os.link(os.path.join(source, name), destination)
+                except OSError:
+                    shutil.copyfile(os.path.join(source, name), destination)
+    except OSError:
+        return False
+    sim_report["frame_set"] = frame_set
+    return True
+
+@app.route('/frames/<frame_set>/<name>')
+def get_frame(frame_set, name):
+    """Serve a rendered simulation frame or animation as a binary image"""
+    if not FRAME_SET_PATTERN.match(frame_set):
+        return "Frame not found", 404
+    return send_from_directory(os.path.abspath(_frame_dir(frame_set)), name, max_age=3600)
+
+@app.route('/metrics')
+def show_metrics():
+    """Stage latency histograms, cache hit rates and queue depths for Prometheus"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is not None:
+        return jsonify(job.to_dict())
+    # Run by another server process
+    stored = results_store.get_job(job_id)
+    if stored is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(stored[1])
+
+@app.route('/jobs/<job_id>/stream')
+def job_stream(job_id):
+    """Stream job progress as Server-Sent Events until the job finishes"""
+    job = job_queue.get(job_id)
+    if job is None:
+        if results_store.get_job(job_id) is None:
+            return jsonify({"error": "Job not found"}), 404
+        return Response(_stored_job_events(job_id), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    
+    def events():
+        version = -1
+        while True:
+            if job.version != version:
+                version = job.version
+                yield f"data: {json.dumps(job.to_dict(include_result=job.finished))}\n\n"
+                if job.finished:
+                    break
+            else:
+                yield ": keep-alive\n\n"
+            job.wait_for_change(version)
+    
+    return Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+def _stored_job_events(job_id):
+    """Server-Sent Events for a job run by another server process, polled from the results store"""
+    version = -1
+    last_sent = time.monotonic()
+    while True:
+        stored = results_store.get_job(job_id)
+        if stored is None:
+            yield f"data: {json.dumps({'job_id': job_id, 'status': 'failed', 'error': 'Job expired'})}\n\n"
+            break
+        if stored[0] != version:
+            version, job = stored
+            yield f"data: {json.dumps(job)}\n\n"
+            last_sent = time.monotonic()
+            if job["status"] in ('done', 'failed'):
+                break
+        elif time.monotonic() - last_sent >= 15:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        time.sleep(JOB_POLL_INTERVAL)
 
 @app.route('/simulation_results/<result_id>')
 def show_simulation_results(result_id):
-    # Load simulation report
-    sim_report_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_sim.json")
-    if not os.path.exists(sim_report_path):
+    try:
+        record, pagination = _report_page(result_id)
+    except ValueError as e:
+        return str(e), 400
+    if record is None or record["simulation_report"] is None:
         return "Simulation result not found", 404
     
-    with open(sim_report_path, 'r') as f:
-        sim_report = json.load(f)
-    
-    # Load text report
-    report_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{result_id}_sim_report.txt")
-    with open(report_path, 'r') as f:
-        text_report = f.read()
-    
     return render_template('simulation_results.html',
                           result_id=result_id,
-                          sim_report=sim_report["simulation_report"],
-                          text_report=text_report)
+                          sim_report=record["simulation_report"],
+                          pagination=pagination,
+                          text_report=generate_text_report(record["check_report"], record["simulation_report"],
+                                                           record["file_count"]))
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
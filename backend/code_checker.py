@@ -2,22 +2,53 @@ import os
 import re
 import ast
 import json
-import subprocess
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
+from backend.ros_extractor import extract_ros_elements, find_joint_values
+from backend.result_cache import file_cache_key
+from backend.cpp_checker import get_cpp_checker
+from backend.dependencies import HeaderIndex, find_package_root
+from backend.safety_rules import check_python, check_cpp, format_finding
+from backend.metrics import metrics
+
+# Bump whenever the contents of a check report change, to invalidate cached results
+CHECKER_VERSION = '1.3'
+
+PACKAGE_MARKERS = ('package.xml', 'CMakeLists.txt', 'setup.py')
+
+def new_report() -> Dict:
+    """Return an empty check report"""
+    return {
+        "errors": [],
+        "warnings": [],
+        "ros_elements": {
+            "publishers": [],
+            "subscribers": [],
+            "services": [],
+            "init_node": False
+        },
+        "safety_issues": [],
+        "joint_values": {}
+    }
+
+def check_cache_key(file_path: str, root_dir: str = None, headers: HeaderIndex = None) -> str:
+    """Cache key for a file's check report
+    
+    Covers the file's contents, the package files present in its package root and,
+    for C++ files given a header index, the contents of every header it includes.
+    """
+    package_dir = find_package_root(file_path, root_dir)
+    context = ','.join(m for m in PACKAGE_MARKERS if os.path.exists(os.path.join(package_dir, m)))
+    if headers is not None and file_path.endswith('.cpp'):
+        context += ';' + headers.fingerprint(file_path)
+    return file_cache_key(file_path, CHECKER_VERSION, context)
 
 class ROSCodeChecker:
-    def __init__(self):
-        self.report = {
-            "errors": [],
-            "warnings": [],
-            "ros_elements": {
-                "publishers": [],
-                "subscribers": [],
-                "services": [],
-                "init_node": False
-            },
-            "safety_issues": []
-        }
+    def __init__(self, cpp_results: Dict[str, Tuple[bool, str]] = None, root_dir: str = None):
+        self.report = new_report()
+        # C++ syntax results computed ahead of time (e.g. batched for a whole workspace)
+        self.cpp_results = cpp_results or {}
+        # Workspace the checked files belong to, for finding their package roots
+        self.root_dir = root_dir
     
     def check_file(self, file_path: str) -> Dict:
         """Main method to check the ROS code"""
@@ -27,7 +58,7 @@ class ROSCodeChecker:
             self._check_cpp_file(file_path)
         
         # Check ROS package structure if in a package
-        package_dir = os.path.dirname(file_path)
+        package_dir = find_package_root(file_path, self.root_dir)
         self._check_package_structure(package_dir)
         
         return self.report
@@ -40,32 +71,27 @@ class ROSCodeChecker:
                 content = f.read()
             
             try:
-                ast.parse(content)
+                with metrics.stage('check.parse'):
+                    tree = ast.parse(content)
             except SyntaxError as e:
                 self.report["errors"].append(f"Syntax error: {str(e)}")
                 return
             
-            # Check for ROS elements
-            if 'rospy.init_node' in content:
+            # Collect ROS elements and joint values in a single AST pass
+            with metrics.stage('check.ros_elements'):
+                extracted = extract_ros_elements(tree)
+            elements = extracted["ros_elements"]
+            if elements["init_node"]:
                 self.report["ros_elements"]["init_node"] = True
-            
-            # Find publishers
-            publishers = re.findall(r'(\w+)\s*=\s*rospy\.Publisher\([\'"]([^\'"]+)[\'"]', content)
-            for var_name, topic in publishers:
-                self.report["ros_elements"]["publishers"].append({"variable": var_name, "topic": topic})
-            
-            # Find subscribers
-            subscribers = re.findall(r'rospy\.Subscriber\([\'"]([^\'"]+)[\'"]', content)
-            for topic in subscribers:
-                self.report["ros_elements"]["subscribers"].append(topic)
-            
-            # Find services
-            services = re.findall(r'(\w+)\s*=\s*rospy\.Service\([\'"]([^\'"]+)[\'"]', content)
-            for var_name, service in services:
-                self.report["ros_elements"]["services"].append({"variable": var_name, "service": service})
+            self.report["ros_elements"]["publishers"].extend(elements["publishers"])
+            self.report["ros_elements"]["subscribers"].extend(elements["subscribers"])
+            self.report["ros_elements"]["services"].extend(elements["services"])
+            self.report["joint_values"] = extracted["joint_values"]
             
             # Basic safety checks
-            self._check_python_safety(content)
+            with metrics.stage('check.safety'):
+                self._check_python_safety(tree)
+                self._check_joint_ranges()
             
         except Exception as e:
             self.report["errors"].append(f"Error checking Python file: {str(e)}")
@@ -74,45 +100,54 @@ class ROSCodeChecker:
         """Check C++ ROS code"""
         try:
             # Syntax check using g++ dry run
-            result = subprocess.run(
-                ['g++', '-fsyntax-only', file_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            if file_path in self.cpp_results:
+                ok, output = self.cpp_results[file_path]
+            else:
+                with metrics.stage('cpp.syntax'):
+                    ok, output = get_cpp_checker().check(file_path)
             
-            if result.returncode != 0:
-                self.report["errors"].append(f"C++ syntax error: {result.stderr}")
+            if not ok:
+                self.report["errors"].append(f"C++ syntax error: {output}")
                 return
             
             # Check for ROS elements
             with open(file_path, 'r') as f:
                 content = f.read()
             
-            if 'ros::init' in content:
-                self.report["ros_elements"]["init_node"] = True
-            
-            # Find publishers
-            publishers = re.findall(r'ros::Publisher\s+(\w+)\s*=\s*n\.advertise<[^>]+>\([\'"]([^\'"]+)[\'"]', content)
-            for var_name, topic in publishers:
-                self.report["ros_elements"]["publishers"].append({"variable": var_name, "topic": topic})
-            
-            # Find subscribers
-            subscribers = re.findall(r'n\.subscribe<[^>]+>\([\'"]([^\'"]+)[\'"]', content)
-            for topic in subscribers:
-                self.report["ros_elements"]["subscribers"].append(topic)
-            
-            # Find services
-            services = re.findall(r'ros::ServiceServer\s+(\w+)\s*=\s*n\.advertiseService\([\'"]([^\'"]+)[\'"]', content)
-            for var_name, service in services:
-                self.report["ros_elements"]["services"].append({"variable": var_name, "service": service})
+            with metrics.stage('check.ros_elements'):
+                self._find_cpp_elements(content)
             
             # Basic safety checks
-            self._check_cpp_safety(content)
+            with metrics.stage('check.safety'):
+                self._check_cpp_safety(content)
+                self._check_joint_ranges()
             
         except Exception as e:
             self.report["errors"].append(f"Error checking C++ file: {str(e)}")
     
+    def _find_cpp_elements(self, content: str):
+        """Collect ROS constructs and joint values from C++ source text"""
+        if 'ros::init' in content:
+            self.report["ros_elements"]["init_node"] = True
+        
+        # Find publishers
+        publishers = re.findall(r'ros::Publisher\s+(\w+)\s*=\s*n\.advertise<[^>]+>\([\'"]([^\'"]+)[\'"]', content)
+        for var_name, topic in publishers:
+            self.report["ros_elements"]["publishers"].append({"variable": var_name, "topic": topic})
+        
+        # Find subscribers
+        subscribers = re.findall(r'n\.subscribe<[^>]+>\([\'"]([^\'"]+)[\'"]', content)
+        for topic in subscribers:
+            self.report["ros_elements"]["subscribers"].append(topic)
+        
+        # Find services
+        services = re.findall(r'ros::ServiceServer\s+(\w+)\s*=\s*n\.advertiseService\([\'"]([^\'"]+)[\'"]', content)
+        for var_name, service in services:
+            self.report["ros_elements"]["services"].append({"variable": var_name, "service": service})
+        
+        self.report["joint_values"] = find_joint_values(content)
+    
+    @metrics.timed('check.package')
     def _check_package_structure(self, package_dir: str):
         """Check if the directory contains a valid ROS package structure"""
         package_xml = os.path.join(package_dir, 'package.xml')
@@ -125,34 +160,21 @@ class ROSCodeChecker:
         if not os.path.exists(cmake_lists) and not os.path.exists(setup_py):
             self.report["warnings"].append("Neither CMakeLists.txt nor setup.py found. This might not be a valid ROS package.")
     
-    def _check_python_safety(self, content: str):
+    def _check_python_safety(self, tree: ast.AST):
         """Check for basic safety issues in Python code"""
-        # Check for loops without sleep
-        if re.search(r'while\s+True:.*?(?!rospy\.sleep|time\.sleep)', content, re.DOTALL):
-            self.report["safety_issues"].append("Potential infinite loop without sleep detected")
-        
-        # Check for joint values that might be out of range
-        joint_values = re.findall(r'joint[_\s]*(\w+)[_\s]*value[s]*\s*=\s*([-\d.]+)', content, re.IGNORECASE)
-        for joint, value in joint_values:
-            try:
-                val = float(value)
-                if abs(val) > 3.14:  # Assuming radians, most joints shouldn't exceed ±π
-                    self.report["safety_issues"].append(f"Joint value {val} for {joint} might be out of safe range")
-            except ValueError:
-                pass
+        # All registered rules, in one pass over the AST
+        for finding in check_python(tree):
+            self.report["safety_issues"].append(format_finding(finding))
     
     def _check_cpp_safety(self, content: str):
         """Check for basic safety issues in C++ code"""
-        # Check for loops without sleep
-        if re.search(r'while\s*\(\s*true\s*\).*?(?!ros::Duration|ros::Rate)', content, re.DOTALL):
-            self.report["safety_issues"].append("Potential infinite loop without sleep detected")
-        
-        # Check for joint values that might be out of range
-        joint_values = re.findall(r'joint[_\s]*(\w+)[_\s]*value[s]*\s*=\s*([-\d.]+)', content, re.IGNORECASE)
-        for joint, value in joint_values:
-            try:
-                val = float(value)
+        # All registered rules, in one pass over the token stream
+        for finding in check_cpp(content):
+            self.report["safety_issues"].append(format_finding(finding))
+    
+    def _check_joint_ranges(self):
+        """Flag joint values that might be out of range"""
+        for joint, values in self.report["joint_values"].items():
+            for val in values:
                 if abs(val) > 3.14:  # Assuming radians, most joints shouldn't exceed ±π
-                    self.report["safety_issues"].append(f"Joint value {val} for {joint} might be out of safe range")
-            except ValueError:
-                pass
\ No newline at end of file
+                    self.report["safety_issues"].append(f"Joint value {val} for {joint} might be out of safe range")
\ No newline at end of file
@@ -0,0 +1,350 @@
+import os
+import re
+import glob
+import json
+import shlex
+import hashlib
+import time
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.metrics import metrics
+
+# Headers precompiled once per flag set and force-included into files that use them
+PCH_HEADERS = ('ros/ros.h',)
+PCH_INCLUDE_PATTERN = re.compile(r'#\s*include\s*[<"]ros/ros\.h[>"]')
+# Seconds before a precompiled header that failed to build is tried again
+PCH_RETRY_INTERVAL = 60
+
+ERROR_PATTERN = re.compile(r':\s*(fatal\s+)?error:')
+# "In file included from inc/b.h:1," and its "                 from src/node.cpp:1:" continuation lines
+INCLUDE_STACK_PATTERN = re.compile(r'^(?:In file included|\s+) from (.+?)(?::\d+)+[,:]$')
+
+# Flags from compile_commands.json that affect parsing; everything else is dropped
+FLAGS_WITH_VALUE = ('-I', '-isystem', '-iquote', '-include', '-D', '-U')
+STANDALONE_FLAG_PREFIXES = ('-std=', '-f', '-m')
+PATH_FLAGS = ('-I', '-isystem', '-iquote', '-include')
+
+# The subset trusted from a compilation database inside an upload: -f and -m flags can
+# load plugins and -include can read any file, so those are dropped there
+UPLOADED_FLAGS_WITH_VALUE = ('-I', '-isystem', '-iquote', '-D', '-U')
+UPLOADED_FLAG_PREFIXES = ('-std=',)
+
+SyntaxResult = Tuple[bool, str]
+
+def default_include_dirs() -> List[str]:
+    """Include directories of any ROS installation visible to this machine"""
+    include_dirs = []
+    prefixes = [p for p in os.environ.get('CMAKE_PREFIX_PATH', '').split(os.pathsep) if p]
+    prefixes.extend(sorted(glob.glob('/opt/ros/*')))
+    for prefix in prefixes:
+        include_dir = os.path.join(prefix, 'include')
+        if os.path.isdir(include_dir) and include_dir not in include_dirs:
+            include_dirs.append(include_dir)
+    return include_dirs
+
+def _parse_compile_command(entry: Dict, root_dir: str = None) -> Tuple[str, List[str]]:
+    """Return (absolute source path, parse-relevant flags) for one compile_commands entry
+
+    With root_dir the entry comes from an uploaded workspace there: only include paths
+    inside root_dir, macros and -std= are kept.
+    """
+    directory = str(entry.get("directory", ""))
+    if root_dir is not None:
+        directory = os.path.join(root_dir, directory)  # Unchanged if directory is absolute
+        flags_with_value, standalone_prefixes = UPLOADED_FLAGS_WITH_VALUE, UPLOADED_FLAG_PREFIXES
+    else:
+        flags_with_value, standalone_prefixes = FLAGS_WITH_VALUE, STANDALONE_FLAG_PREFIXES
+    if "arguments" in entry:
+        args = [str(arg) for arg in entry["arguments"]]
+    else:
+        args = shlex.split(str(entry.get("command", "")))
+    
+    flags = []
+    i = 1  # Skip the compiler itself
+    while i < len(args):
+        arg = args[i]
+        flag = next((f for f in flags_with_value if arg == f or arg.startswith(f)), None)
+        if flag is not None:
+            value = arg[len(flag):]
+            if not value and i + 1 < len(args):
+                i += 1
+                value = args[i]
+            if flag in PATH_FLAGS:
+                if not os.path.isabs(value):
+                    value = os.path.normpath(os.path.join(directory, value))
+                if root_dir is not None and not _is_within(value, root_dir):
+                    i += 1
+                    continue
+            flags.extend([flag, value])
+        elif arg.startswith(standalone_prefixes) and not arg.startswith('-fsyntax-only'):
+            flags.append(arg)
+        i += 1
+    
+    path = entry.get("file", "")
+    if not os.path.isabs(path):
+        path = os.path.join(directory, path)
+    return os.path.normpath(path), flags
+
+class CppSyntaxChecker:
+    """Syntax-check C++ translation units with a bounded pool of compiler processes
+
+    Files that share flags are checked in batches of one compiler invocation, and
+    files including ros/ros.h use a precompiled header built once per flag set.
+    """
+    
+    def __init__(self, compiler: str = None, max_processes: int = None,
+                 compile_commands: str = None, include_dirs: Iterable[str] = (),
+                 batch_size: int = 8, use_pch: bool = True, pch_dir: str = None, root_dir: str = None):
+        self.compiler = compiler or os.environ.get('CXX', 'g++')
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.use_pch = use_pch
+        self.pch_dir = pch_dir or os.path.join(tempfile.gettempdir(), 'ros_checker_pch')
+        self.include_flags = []
+        for include_dir in list(include_dirs) + default_include_dirs():
+            self.include_flags.extend(['-I', include_dir])
+        # Include paths inside the checked workspace are left out of the precompiled header,
+        # so it is shared by every upload
+        self.root_dir = root_dir
+        self.file_flags = {}
+        self._file_flags_by_name = {}
+        if compile_commands:
+            self.load_compile_commands(compile_commands)
+    
+    def load_compile_commands(self, path: str, root_dir: str = None):
+        """Read per-file flags from a compile_commands.json compilation database
+        
+        Pass root_dir for a database that came with an upload, to keep only the flags
+        that are safe to take from it (see _parse_compile_command).
+        """
+        with open(path, 'r') as f:
+            entries = json.load(f)
+        if not isinstance(entries, list):
+            raise ValueError(f"{path} is not a list of compile commands")
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            source, flags = _parse_compile_command(entry, root_dir)
+            self.file_flags[source] = flags
+            self._file_flags_by_name.setdefault(os.path.basename(source), []).append((source, flags))
+    
+    def flags_for(self, file_path: str) -> List[str]:
+        """Compiler flags for a file: its compilation database entry plus include dirs"""
+        file_path = os.path.normpath(os.path.abspath(file_path))
+        flags = self.file_flags.get(file_path)
+        if flags is None:
+            # Uploaded copies live elsewhere; match the database entry by the longest path suffix
+            candidates = self._file_flags_by_name.get(os.path.basename(file_path), [])
+            best = max(candidates, key=lambda c: _common_suffix_length(c[0], file_path), default=None)
+            flags = best[1] if best else []
+        return flags + self.include_flags
+    
+    def check(self, file_path: str) -> SyntaxResult:
+        """Syntax-check one file, returning (ok, compiler output)"""
+        return self.check_many([file_path])[file_path]
+    
+    def check_many(self, file_paths: Iterable[str]) -> Dict[str, SyntaxResult]:
+        """Syntax-check many files concurrently, returning (ok, compiler output) per path"""
+        groups = {}
+        for path in file_paths:
+            flags = self.flags_for(path)
+            if self.use_pch and _includes_pch_header(path):
+                flags = flags + self._pch_flags(flags)
+            groups.setdefault(tuple(flags), []).append(path)
+        
+        batches = []
+        for flags, paths in groups.items():
+            for i in range(0, len(paths), self.batch_size):
+                batches.append((list(flags), paths[i:i + self.batch_size]))
+        
+        results = {}
+        if len(batches) == 1:
+            results.update(self._check_batch(*batches[0]))
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.max_processes, len(batches))) as executor:
+            for batch_results in executor.map(lambda batch: self._check_batch(*batch), batches):
+                results.update(batch_results)
+        return results
+    
+    @metrics.timed('cpp.compiler')
+    def _run(self, flags: List[str], paths: List[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [self.compiler, '-fsyntax-only'] + flags + paths,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+    
+    def _check_batch(self, flags: List[str], paths: List[str]) -> Dict[str, SyntaxResult]:
+        """Run one compiler process over a batch and attribute its diagnostics per file"""
+        try:
+            result = self._run(flags, paths)
+        except OSError as e:
+            return {path: (False, f"Could not run {self.compiler}: {e}") for path in paths}
+        
+        if len(paths) == 1:
+            return {paths[0]: (result.returncode == 0, result.stderr)}
+        if result.returncode == 0:
+            return {path: (True, '') for path in paths}
+        
+        output = _split_diagnostics(result.stderr, paths)
+        if output is None or not any(ERROR_PATTERN.search(text) for text in output.values()):
+            # Could not tell which file failed; fall back to one process per file
+            results = {}
+            for path in paths:
+                results.update(self._check_batch(flags, [path]))
+            return results
+        return {path: (ERROR_PATTERN.search(output[path]) is None, output[path]) for path in paths}
+    
+    def _pch_flags(self, flags: List[str]) -> List[str]:
+        """Flags that force-include the precompiled ROS header for this flag set, if it builds"""
+        flags = self._pch_build_flags(flags)
+        key = hashlib.sha256('\0'.join([self.compiler] + flags).encode('utf-8')).hexdigest()[:16]
+        header_dir = os.path.join(self.pch_dir, key)
+        with _pch_locks_lock:
+            lock = _pch_locks.setdefault(header_dir, threading.Lock())
+        with lock:
+            header = _pch_headers.get(header_dir)
+            if header is None and time.monotonic() >= _pch_retry_at.get(header_dir, 0):
+                header = self._build_pch(header_dir, flags)
+                if header is None:
+                    _pch_retry_at[header_dir] = time.monotonic() + PCH_RETRY_INTERVAL
+                else:
+                    _pch_headers[header_dir] = header
+        if header is None:
+            return []
+        return ['-include', header, '-Winvalid-pch']
+    
+    def _pch_build_flags(self, flags: List[str]) -> List[str]:
+        """The flags a precompiled header depends on: macros, language options and include paths
+        outside the workspace (ROS and system headers)"""
+        pch_flags = []
+        i = 0
+        while i < len(flags):
+            flag = flags[i]
+            if flag in FLAGS_WITH_VALUE and i + 1 < len(flags):
+                value = flags[i + 1]
+                i += 2
+                if flag == '-include' or (flag in PATH_FLAGS and self.root_dir and _is_within(value, self.root_dir)):
+                    continue
+                pch_flags.extend([flag, value])
+            else:
+                pch_flags.append(flag)
+                i += 1
+        return pch_flags
+    
+    @metrics.timed('cpp.pch')
+    def _build_pch(self, header_dir: str, flags: List[str]) -> Optional[str]:
+        header = os.path.join(header_dir, 'ros_pch.h')
+        gch = header + '.gch'
+        if os.path.exists(gch):
+            return header
+        # Other processes may be building the same header; each builds into its own
+        # temporary files and moves them into place
+        tmp_paths = []
+        try:
+            os.makedirs(header_dir, exist_ok=True)
+            fd, tmp_header = tempfile.mkstemp(dir=header_dir, suffix='.h')
+            tmp_paths.append(tmp_header)
+            with os.fdopen(fd, 'w') as f:
+                for pch_header in PCH_HEADERS:
+                    f.write(f"#include <{pch_header}>\n")
+            fd, tmp_gch = tempfile.mkstemp(dir=header_dir, suffix='.gch')
+            tmp_paths.append(tmp_gch)
+            os.close(fd)
+            result = subprocess.run(
+                [self.compiler, '-x', 'c++-header'] + flags + [tmp_header, '-o', tmp_gch],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if result.returncode != 0:
+                return None
+            os.replace(tmp_header, header)
+            os.replace(tmp_gch, gch)
+        except OSError:
+            if not (os.path.exists(header) and os.path.exists(gch)):
+                return None
+        finally:
+            for path in tmp_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+        return header
+
+def _is_within(path: str, root_dir: str) -> bool:
+    """Whether path resolves to root_dir or something below it, following symlinks"""
+    root = os.path.realpath(root_dir)
+    return os.path.commonpath([os.path.realpath(path), root]) == root
+
+def _common_suffix_length(a: str, b: str) -> int:
+    """Number of trailing path components two paths share"""
+    parts_a = a.split(os.sep)[::-1]
+    parts_b = b.split(os.sep)[::-1]
+    count = 0
+    for part_a, part_b in zip(parts_a, parts_b):
+        if part_a != part_b:
+            break
+        count += 1
+    return count
+
+def _includes_pch_header(file_path: str) -> bool:
+    try:
+        with open(file_path, 'r', errors='replace') as f:
+            return PCH_INCLUDE_PATTERN.search(f.read(64 * 1024)) is not None
+    except OSError:
+        return False
+
+def _split_diagnostics(stderr: str, paths: List[str]) -> Optional[Dict[str, str]]:
+    """Attribute compiler output lines to the translation unit they belong to
+    
+    Returns None when an error cannot be attributed to one of the paths.
+    """
+    output = {path: [] for path in paths}
+    current = None
+    include_stack = []  # Lines of an "In file included from" stack, up to its outermost file
+    for line in stderr.splitlines():
+        match = INCLUDE_STACK_PATTERN.match(line)
+        if match:
+            include_stack.append(line)
+            if line.endswith(':'):
+                # The last "from" line of the stack names the translation unit
+                if match.group(1) not in output:
+                    return None
+                current = match.group(1)
+                output[current].extend(include_stack)
+                include_stack = []
+            continue
+        for path in paths:
+            if line.startswith(path + ':'):
+                current = path
+                break
+        if current is None:
+            if ERROR_PATTERN.search(line):
+                return None
+            continue
+        output[current].append(line)
+    return {path: '\n'.join(lines) for path, lines in output.items()}
+
+# Precompiled headers by directory, shared by every checker in the process
+_pch_headers = {}
+_pch_retry_at = {}  # Directory of a header that failed to build -> when to try again
+_pch_locks = {}
+_pch_locks_lock = threading.Lock()
+
+_default_checker = None
+_default_checker_lock = threading.Lock()
+
+def get_cpp_checker() -> CppSyntaxChecker:
+    """Shared checker configured from COMPILE_COMMANDS and CPP_CHECK_PROCESSES"""
+    global _default_checker
+    with _default_checker_lock:
+        if _default_checker is None:
+            _default_checker = CppSyntaxChecker(
+                max_processes=int(os.environ.get('CPP_CHECK_PROCESSES', 0)) or None,
+                compile_commands=os.environ.get('COMPILE_COMMANDS') or None
+            )
+        return _default_checker
\ No newline at end of file
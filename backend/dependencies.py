@@ -0,0 +1,96 @@
+import os
+import re
+from typing import List, Optional, Set
+
+from backend.result_cache import content_hash
+
+INCLUDE_PATTERN = re.compile(r'^[ \t]*#[ \t]*include[ \t]*[<"]([^>"\n]+)[>"]', re.MULTILINE)
+
+# Sources and headers larger than this are not scanned for includes
+MAX_SCAN_BYTES = 4 * 1024 * 1024
+
+def find_include_dirs(root_dir: str) -> List[str]:
+    """Return the include/ directories of every package under root_dir"""
+    return sorted(root for root, _, _ in os.walk(root_dir) if os.path.basename(root) == 'include')
+
+def find_package_root(file_path: str, root_dir: Optional[str] = None) -> str:
+    """Nearest directory above file_path (up to root_dir) holding a package.xml
+
+    Without root_dir, or when no package.xml is found, the file's own directory.
+    """
+    if root_dir is None:
+        return os.path.dirname(file_path)
+    root_dir = os.path.abspath(root_dir)
+    current = os.path.dirname(os.path.abspath(file_path))
+    while current == root_dir or current.startswith(root_dir + os.sep):
+        if os.path.exists(os.path.join(current, 'package.xml')):
+            return current
+        if current == root_dir:
+            break
+        current = os.path.dirname(current)
+    return os.path.dirname(file_path)
+
+class HeaderIndex:
+    """Resolves the workspace headers a C++ file includes, directly or transitively
+
+    Headers are looked up next to the including file, then in the include/
+    directories of the workspace's packages; system headers are ignored.
+    """
+    
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._include_dirs = None
+        self._includes = {}  # path -> resolved direct includes
+        self._hashes = {}  # header path -> content hash
+    
+    @property
+    def include_dirs(self) -> List[str]:
+        # Found on first use; a streamed upload writes its headers before any source
+        if self._include_dirs is None:
+            self._include_dirs = find_include_dirs(self.root_dir)
+        return self._include_dirs
+    
+    def headers(self, file_path: str) -> Set[str]:
+        """Every workspace header file_path includes, directly or through other headers"""
+        seen = set()
+        pending = [file_path]
+        while pending:
+            for header in self._direct_includes(pending.pop()):
+                if header not in seen:
+                    seen.add(header)
+                    pending.append(header)
+        return seen
+    
+    def fingerprint(self, file_path: str) -> str:
+        """Hash over the contents of every header file_path depends on"""
+        parts = []
+        for header in sorted(self.headers(file_path)):
+            if header not in self._hashes:
+                with open(header, 'rb') as f:
+                    self._hashes[header] = content_hash(f.read())
+            parts.extend([os.path.relpath(header, self.root_dir), self._hashes[header]])
+        return content_hash('headers', *parts)
+    
+    def _direct_includes(self, path: str) -> List[str]:
+        includes = self._includes.get(path)
+        if includes is None:
+            try:
+                with open(path, 'r', errors='replace') as f:
+                    content = f.read(MAX_SCAN_BYTES)
+            except OSError:
+                content = ''
+            includes = []
+            for name in INCLUDE_PATTERN.findall(content):
+                header = self._resolve(path, name.strip())
+                if header is not None:
+                    includes.append(header)
+            self._includes[path] = includes
+        return includes
+    
+    def _resolve(self, including_file: str, name: str) -> Optional[str]:
+        root = os.path.abspath(self.root_dir) + os.sep
+        for directory in [os.path.dirname(including_file)] + self.include_dirs:
+            candidate = os.path.normpath(os.path.join(directory, name))
+            if os.path.abspath(candidate).startswith(root) and os.path.isfile(candidate):
+                return candidate
+        return None
\ No newline at end of file
@@ -1,37 +1,127 @@
 import os
+import zlib
 import zipfile
 import tempfile
 import shutil
+from typing import Iterator
+
+from backend.metrics import metrics
+
+# Archive entries worth materializing; everything else in an upload is skipped
+SOURCE_EXTENSIONS = ('.py', '.cpp')
+SUPPORT_EXTENSIONS = ('.h', '.hpp')
+SUPPORT_FILENAMES = ('package.xml', 'CMakeLists.txt', 'compile_commands.json')
+
+# Default archive limits, against zip bombs and oversized uploads
+MAX_TOTAL_SIZE = 64 * 1024 * 1024  # Uncompressed bytes materialized per upload
+MAX_ENTRIES = 10000  # Entries in the archive's central directory
+MAX_ENTRY_SIZE = 8 * 1024 * 1024  # Uncompressed bytes per entry
+
+READ_CHUNK_SIZE = 64 * 1024
+
+class UploadRejected(ValueError):
+    """Raised when an uploaded archive is invalid or breaks a size, count or path limit"""
+    
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
 
 def handle_upload(file):
     """Handle uploaded file, extract if ZIP, return file path and temp directory"""
     temp_dir = tempfile.mkdtemp()
     
     if file.filename.endswith('.zip'):
-        # Extract ZIP file
-        zip_path = os.path.join(temp_dir, 'upload.zip')
-        file.save(zip_path)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-        
         # Find main Python or C++ file
-        main_file = None
-        for root, _, files in os.walk(temp_dir):
-            for f in files:
-                if f.endswith('.py') or f.endswith('.cpp'):
-                    main_file = os.path.join(root, f)
-                    break
-            if main_file:
-                break
-        
+        main_file = next(iter_workspace_upload(file, temp_dir), None)
         return main_file, temp_dir
     else:
         # Single file upload
-        file_path = os.path.join(temp_dir, file.filename)
-        file.save(file_path)
+        file_path = os.path.join(temp_dir, os.path.basename(file.filename))
+        with metrics.stage('upload.save'):
+            file.save(file_path)
         return file_path, temp_dir
 
+def handle_workspace_upload(file, **limits):
+    """Extract an uploaded ZIP, return every source file path and the temp directory"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        return list(iter_workspace_upload(file, temp_dir, **limits)), temp_dir
+    except Exception:
+        cleanup_temp_dir(temp_dir)
+        raise
+
+def iter_workspace_upload(file, temp_dir: str, max_total_size: int = MAX_TOTAL_SIZE,
+                          max_entries: int = MAX_ENTRIES, max_entry_size: int = MAX_ENTRY_SIZE) -> Iterator[str]:
+    """Stream the relevant entries of an uploaded ZIP into temp_dir, yielding source paths
+
+    Entries are read straight from the upload stream, without saving the archive first.
+    Package files and headers are written before any source file, so each yielded
+    source can be checked right away.
+    """
+    try:
+        zip_ref = zipfile.ZipFile(getattr(file, 'stream', file), 'r')
+    except zipfile.BadZipFile:
+        raise UploadRejected("Uploaded file is not a valid ZIP archive")
+    
+    with zip_ref:
+        entries = zip_ref.infolist()
+        if len(entries) > max_entries:
+            raise UploadRejected(f"ZIP archive has {len(entries)} entries (limit {max_entries})", 413)
+        
+        wanted = []
+        for info in entries:
+            if info.is_dir():
+                continue
+            name = _safe_entry_name(info.filename)
+            base = os.path.basename(name)
+            if base.endswith(SOURCE_EXTENSIONS):
+                wanted.append((1, name, info))
+            elif base.endswith(SUPPORT_EXTENSIONS) or base in SUPPORT_FILENAMES:
+                wanted.append((0, name, info))
+        wanted.sort(key=lambda entry: entry[0])
+        
+        total_size = 0
+        for is_source, name, info in wanted:
+            if info.file_size > max_entry_size:
+                raise UploadRejected(f"{name} is {info.file_size} bytes uncompressed (limit {max_entry_size})", 413)
+            
+            with metrics.stage('upload.extract'):
+                # Count the bytes actually inflated; the sizes in the archive can lie
+                data = bytearray()
+                try:
+                    with zip_ref.open(info) as entry:
+                        while True:
+                            chunk = entry.read(READ_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            data.extend(chunk)
+                            if len(data) > max_entry_size:
+                                raise UploadRejected(f"{name} exceeds {max_entry_size} bytes uncompressed", 413)
+                except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError) as e:
+                    raise UploadRejected(f"Cannot read {name} from the ZIP archive: {e}")
+                total_size += len(data)
+                if total_size > max_total_size:
+                    raise UploadRejected(f"ZIP archive exceeds {max_total_size} bytes uncompressed", 413)
+                
+                path = os.path.join(temp_dir, *name.split('/'))
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                except OSError as e:
+                    # e.g. both 'inc/a.h' and 'inc/a.h/b.py' are in the archive
+                    raise UploadRejected(f"Cannot extract {name}: {e.strerror or e}")
+            if is_source:
+                yield path
+
+def _safe_entry_name(name: str) -> str:
+    """Normalize an archive member name, rejecting absolute paths and '..' components"""
+    name = name.replace('\\', '/')
+    parts = [part for part in name.split('/') if part not in ('', '.')]
+    if name.startswith('/') or (parts and ':' in parts[0]) or '..' in parts or not parts:
+        raise UploadRejected(f"Unsafe path in ZIP archive: {name}")
+    return '/'.join(parts)
+
 def cleanup_temp_dir(temp_dir):
     """Clean up temporary directory"""
     if os.path.exists(temp_dir):
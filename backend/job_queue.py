@@ -0,0 +1,172 @@
+import time
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+class Job:
+    """A unit of background work with status and progress that clients can poll"""
+    
+    def __init__(self, kind: str = '', on_change: Callable[['Job'], None] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = ''
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0
+        self._changed = threading.Condition()
+        self._on_change = on_change
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+    
+    def update(self, progress: float, message: str = ''):
+        """Record progress (0.0 - 1.0) and wake up anyone streaming this job"""
+        with self._changed:
+            self.progress = progress
+            if message:
+                self.message = message
+            self.version += 1
+            self._changed.notify_all()
+        self._notify()
+    
+    def _set_status(self, status: str, result=None, error: str = None):
+        with self._changed:
+            self.status = status
+            if status == 'running':
+                self.started_at = time.time()
+            if status in ('done', 'failed'):
+                self.finished_at = time.time()
+                self.result = result
+                self.error = error
+                if status == 'done':
+                    self.progress = 1.0
+            self.version += 1
+            self._changed.notify_all()
+        self._notify()
+    
+    def _notify(self):
+        if self._on_change is None:
+            return
+        try:
+            self._on_change(self)
+        except Exception:
+            pass  # Publishing the state must never fail the job itself
+    
+    def wait_for_change(self, version: int, timeout: float = 15.0) -> int:
+        """Block until the job changes past version (or timeout), return the new version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout=timeout)
+            return self.version
+    
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "message": self.message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_result and self.status == 'done':
+            data["result"] = self.result
+        return data
+
+class JobQueue:
+    """Bounded queue of jobs run by a fixed pool of background worker threads
+
+    on_change, if set, is called with a job after every change to it, e.g. to publish
+    its state to other processes.
+    """
+    
+    def __init__(self, workers: int = 4, max_queue: int = 32, max_finished: int = 1000,
+                 on_change: Callable[[Job], None] = None):
+        self.workers = workers
+        self.on_change = on_change
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+    
+    def submit(self, fn: Callable, *args, kind: str = '', **kwargs) -> Job:
+        """Queue fn(*args, progress=job.update, **kwargs); raise QueueFullError when full"""
+        self._start()
+        job = Job(kind, self.on_change)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        try:
+            self._queue.put_nowait((job, fn, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting)")
+        # A worker may have published a newer state already; stores keep the highest version
+        job._notify()
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize()
+    
+    def running(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == 'running')
+    
+    def shutdown(self):
+        """Stop the workers once the jobs already queued have run"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+    
+    def _start(self):
+        # Workers start on first use so importing the app never spawns threads
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job, fn, args, kwargs = item
+            job._set_status('running')
+            try:
+                result = fn(*args, progress=job.update, **kwargs)
+            except Exception as e:
+                job._set_status('failed', error=str(e))
+            else:
+                job._set_status('done', result=result)
+    
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
\ No newline at end of file
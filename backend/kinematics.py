@@ -0,0 +1,307 @@
+import os
+import json
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+MOVABLE_JOINT_TYPES = ('revolute', 'continuous', 'prismatic')
+
+def translation(xyz: Sequence[float]) -> np.ndarray:
+    transform = np.eye(4)
+    transform[:3, 3] = xyz
+    return transform
+
+def rotation_x(angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    transform = np.eye(4)
+    transform[1:3, 1:3] = [[c, -s], [s, c]]
+    return transform
+
+def rotation_z(angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    transform = np.eye(4)
+    transform[:2, :2] = [[c, -s], [s, c]]
+    return transform
+
+def rpy_transform(xyz: Sequence[float] = (0, 0, 0), rpy: Sequence[float] = (0, 0, 0)) -> np.ndarray:
+    """Homogeneous transform of a URDF-style origin: fixed-axis roll, pitch, yaw, then xyz"""
+    roll, pitch, yaw = rpy
+    cr, sr, cp, sp, cy, sy = np.cos(roll), np.sin(roll), np.cos(pitch), np.sin(pitch), np.cos(yaw), np.sin(yaw)
+    transform = translation(xyz)
+    transform[:3, :3] = [
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr]
+    ]
+    return transform
+
+class Joint:
+    """One joint of a serial chain: T_child = T_parent @ before @ motion(q) @ after"""
+    
+    def __init__(self, name: str, joint_type: str = 'revolute', axis: Sequence[float] = (0, 0, 1),
+                 before: np.ndarray = None, after: np.ndarray = None,
+                 lower: float = -np.inf, upper: float = np.inf):
+        if joint_type not in MOVABLE_JOINT_TYPES + ('fixed',):
+            raise ValueError(f"Joint {name}: unsupported joint type {joint_type!r}")
+        axis = np.asarray(axis, dtype=float)
+        norm = np.linalg.norm(axis)
+        if joint_type != 'fixed' and norm == 0:
+            raise ValueError(f"Joint {name}: axis must not be zero")
+        self.name = name
+        self.type = joint_type
+        self.axis = axis / norm if norm else axis
+        self.before = before if before is not None else np.eye(4)
+        self.after = after if after is not None else np.eye(4)
+        self.lower = lower
+        self.upper = upper
+
+class RobotModel:
+    """A serial kinematic chain with its static link transforms folded and precomputed
+
+    Forward kinematics is static[0] @ motion(q0) @ static[1] @ ... @ motion(q_n-1) @ static[n],
+    evaluated for any number of joint vectors at once as batched 4x4 products. Fixed joints,
+    the base and the tool are folded into the static transforms when the model is built.
+    """
+    
+    def __init__(self, name: str, joints: List[Joint], base: np.ndarray = None, tool: np.ndarray = None,
+                 fingerprint: str = ''):
+        self.name = name
+        self.fingerprint = fingerprint
+        movable = [joint for joint in joints if joint.type != 'fixed']
+        if not movable:
+            raise ValueError(f"Robot model {name} has no movable joints")
+        self.joint_names = [joint.name for joint in movable]
+        
+        statics = []
+        pending = base if base is not None else np.eye(4)
+        for joint in joints:
+            pending = pending @ joint.before
+            if joint.type == 'fixed':
+                pending = pending @ joint.after
+                continue
+            statics.append(pending)
+            pending = joint.after
+        statics.append(pending @ (tool if tool is not None else np.eye(4)))
+        self._statics = np.stack(statics)  # (dof + 1, 4, 4)
+        
+        axes = np.array([joint.axis for joint in movable])
+        self._axes = axes
+        self._prismatic = np.array([joint.type == 'prismatic' for joint in movable])
+        # Rodrigues terms per joint: R(q) = I + sin(q) K + (1 - cos(q)) K^2
+        cross = np.zeros((len(movable), 3, 3))
+        cross[:, 0, 1], cross[:, 0, 2] = -axes[:, 2], axes[:, 1]
+        cross[:, 1, 0], cross[:, 1, 2] = axes[:, 2], -axes[:, 0]
+        cross[:, 2, 0], cross[:, 2, 1] = -axes[:, 1], axes[:, 0]
+        self._cross = cross
+        self._cross2 = cross @ cross
+        self.lower = np.array([joint.lower for joint in movable])
+        self.upper = np.array([joint.upper for joint in movable])
+    
+    @property
+    def dof(self) -> int:
+        return len(self.joint_names)
+    
+    def forward(self, q: np.ndarray, link_scale: np.ndarray = None) -> np.ndarray:
+        """(N, dof + 1, 4, 4) frames of every joint (before its motion) and of the tool
+        
+        link_scale, a scalar or (N,) array, scales every static link offset, e.g. to model
+        manufacturing tolerances per scenario.
+        """
+        q = np.atleast_2d(np.asarray(q, dtype=float))
+        if q.shape[1] != self.dof:
+            raise ValueError(f"Robot model {self.name} has {self.dof} joints, got {q.shape[1]} values")
+        n = len(q)
+        scale = np.asarray(link_scale, dtype=float).reshape(-1, 1) if link_scale is not None else None
+        sin, one_minus_cos = np.sin(q)[:, :, None, None], 1.0 - np.cos(q)[:, :, None, None]
+        
+        # Every product below has one operand shared by all N chains, so each is a single
+        # (4N, 4) x (4, k) matrix product instead of N small ones
+        frames = np.empty((n, self.dof + 1, 4, 4))
+        transform = np.broadcast_to(np.eye(4), (n, 4, 4))
+        for i in range(self.dof + 1):
+            linked = (transform.reshape(-1, 4) @ self._statics[i]).reshape(n, 4, 4)
+            if scale is not None:
+                origin = transform[:, :3, 3]
+                linked[:, :3, 3] = origin + scale * (linked[:, :3, 3] - origin)
+            frames[:, i] = transform = linked
+            if i == self.dof:
+                break
+            
+            axes = transform[:, :, :3].reshape(-1, 3)
+            moved = transform.copy()
+            if self._prismatic[i]:
+                moved[:, :, 3] += q[:, i, None] * (axes @ self._axes[i]).reshape(n, 4)
+            else:
+                # Rodrigues: R(q) = I + sin(q) K + (1 - cos(q)) K^2
+                moved[:, :, :3] += (sin[:, i] * (axes @ self._cross[i]).reshape(n, 4, 3)
+                                    + one_minus_cos[:, i] * (axes @ self._cross2[i]).reshape(n, 4, 3))
+            transform = moved
+        return frames
+    
+    def positions(self, q: np.ndarray, link_scale: np.ndarray = None) -> np.ndarray:
+        """(N, dof + 1, 3) positions of every joint and of the tool"""
+        return self.forward(q, link_scale)[..., :3, 3]
+    
+    def end_effector(self, q: np.ndarray, link_scale: np.ndarray = None) -> np.ndarray:
+        """(N, 4, 4) tool frames"""
+        return self.forward(q, link_scale)[:, -1]
+    
+    def joint_values(self, commands: np.ndarray, clamp: bool = True) -> np.ndarray:
+        """Map (N, K) commanded joint values onto this model's joints in order, padding with zeros
+
+        Values are clamped to the joint limits, as a controller saturating at them would.
+        """
+        commands = np.atleast_2d(np.asarray(commands, dtype=float))
+        q = np.zeros((len(commands), self.dof))
+        count = min(self.dof, commands.shape[1])
+        q[:, :count] = commands[:, :count]
+        if clamp:
+            np.clip(q, self.lower, self.upper, out=q)
+        return q
+    
+    def limit_violations(self, commands: np.ndarray, command_names: Sequence[str]) -> List[Dict]:
+        """Commanded joints whose (N, K) values leave the joint limits, with their commanded range"""
+        q = self.joint_values(commands, clamp=False)
+        violations = []
+        for i, command in enumerate(command_names[:self.dof]):
+            low, high = float(q[:, i].min()), float(q[:, i].max())
+            if low < self.lower[i] or high > self.upper[i]:
+                violations.append({
+                    "joint": command,
+                    "model_joint": self.joint_names[i],
+                    "min": low,
+                    "max": high,
+                    # Infinite limits are not valid JSON
+                    "lower": float(self.lower[i]) if np.isfinite(self.lower[i]) else None,
+                    "upper": float(self.upper[i]) if np.isfinite(self.upper[i]) else None
+                })
+        return violations
+
+def dh_model(name: str, parameters: List[Dict], convention: str = 'standard', base: np.ndarray = None,
+             tool: np.ndarray = None, fingerprint: str = '') -> RobotModel:
+    """Build a model from Denavit-Hartenberg rows with a, alpha, d and theta (the joint offset)
+
+    The standard convention chains Rz(theta) Tz(d) Tx(a) Rx(alpha); the modified (Craig)
+    convention chains Rx(alpha) Tx(a) Rz(theta) Tz(d). Rows may set type to 'prismatic'
+    (the joint then moves along z, added to d) and limits to [lower, upper].
+    """
+    if convention not in ('standard', 'modified'):
+        raise ValueError(f"Unknown DH convention {convention!r}")
+    joints = []
+    for i, row in enumerate(parameters):
+        a, alpha = float(row.get('a', 0.0)), float(row.get('alpha', 0.0))
+        d, theta = float(row.get('d', 0.0)), float(row.get('theta', 0.0))
+        lower, upper = row.get('limits', (-np.inf, np.inf))
+        # Rz(q) and Tz(q) commute with Rz(theta) and Tz(d), so the joint motion can sit on either side
+        if convention == 'standard':
+            before, after = np.eye(4), rotation_z(theta) @ translation((0, 0, d)) @ translation((a, 0, 0)) @ rotation_x(alpha)
+        else:
+            before, after = rotation_x(alpha) @ translation((a, 0, 0)) @ rotation_z(theta) @ translation((0, 0, d)), np.eye(4)
+        joints.append(Joint(row.get('name', f"joint{i + 1}"), row.get('type', 'revolute'), (0, 0, 1),
+                            before, after, float(lower), float(upper)))
+    return RobotModel(name, joints, base, tool, fingerprint)
+
+def _origin(data: Optional[Dict]) -> Optional[np.ndarray]:
+    if not data:
+        return None
+    return rpy_transform(data.get('xyz', (0, 0, 0)), data.get('rpy', (0, 0, 0)))
+
+def load_dh(path: str) -> RobotModel:
+    """Load a DH parameter file: JSON with name, convention, joints and optional base/tool origins"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    try:
+        data = json.loads(content)
+        return dh_model(data.get('name', os.path.basename(path)), data['joints'], data.get('convention', 'standard'),
+                        _origin(data.get('base')), _origin(data.get('tool')), hashlib.sha256(content).hexdigest())
+    except (KeyError, TypeError, AttributeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid DH parameter file {path}: {e}")
+
+def _floats(text: Optional[str], default: Sequence[float]) -> List[float]:
+    return [float(v) for v in text.split()] if text else list(default)
+
+def load_urdf(path: str, tip_link: str = None) -> RobotModel:
+    """Load the serial chain of a URDF, from the root link to tip_link
+
+    Without tip_link, the chain to the link with the most movable joints above it is used.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    try:
+        robot = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid URDF {path}: {e}")
+    
+    by_child = {}
+    children = {}
+    for element in robot.findall('joint'):
+        parent, child = element.find('parent'), element.find('child')
+        if parent is None or child is None:
+            raise ValueError(f"Invalid URDF {path}: joint {element.get('name')} needs a parent and a child")
+        by_child[child.get('link')] = element
+        children.setdefault(parent.get('link'), []).append(child.get('link'))
+    if not by_child:
+        raise ValueError(f"URDF {path} has no joints")
+    
+    if tip_link is None:
+        # Deepest chain by movable joints, found with one pass from each root
+        most_movable = -1
+        stack = [(link, 0) for link in children if link not in by_child]
+        while stack:
+            link, movable = stack.pop()
+            if movable > most_movable:
+                most_movable, tip_link = movable, link
+            for child in children.get(link, []):
+                if child in by_child and by_child[child].get('type') in MOVABLE_JOINT_TYPES:
+                    stack.append((child, movable + 1))
+                else:
+                    stack.append((child, movable))
+    elif tip_link not in by_child:
+        raise ValueError(f"URDF {path} has no link {tip_link!r} below a joint")
+    
+    chain = []
+    link = tip_link
+    while link in by_child:
+        element = by_child[link]
+        chain.append(element)
+        link = element.find('parent').get('link')
+        if len(chain) > len(by_child):
+            raise ValueError(f"URDF {path} has a joint cycle")
+    
+    joints = []
+    for element in reversed(chain):
+        origin = element.find('origin')
+        axis = element.find('axis')
+        limit = element.find('limit')
+        joint_type = element.get('type', 'fixed')
+        lower, upper = -np.inf, np.inf
+        if limit is not None and joint_type != 'continuous':
+            lower, upper = float(limit.get('lower', -np.inf)), float(limit.get('upper', np.inf))
+        joints.append(Joint(
+            element.get('name'), joint_type,
+            _floats(axis.get('xyz') if axis is not None else None, (1, 0, 0)),
+            rpy_transform(_floats(origin.get('xyz') if origin is not None else None, (0, 0, 0)),
+                          _floats(origin.get('rpy') if origin is not None else None, (0, 0, 0))),
+            None, lower, upper
+        ))
+    return RobotModel(robot.get('name', os.path.basename(path)), joints, fingerprint=hashlib.sha256(content).hexdigest())
+
+_models = {}  # Absolute path -> (modification stamp, model)
+_models_lock = threading.Lock()
+
+def load_model(path: str) -> RobotModel:
+    """Load a robot model from a .urdf or DH .json file, cached until the file changes"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _models_lock:
+        cached = _models.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    model = load_urdf(path) if path.lower().endswith(('.urdf', '.xml')) else load_dh(path)
+    with _models_lock:
+        _models[path] = (stamp, model)
+    return model
\ No newline at end of file
@@ -0,0 +1,141 @@
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Timing = Tuple[str, float]
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style"""
+    
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """Per-stage latency histograms plus gauges read on demand, rendered for /metrics
+
+    Stage timings go to the histograms and to the profile of the current thread,
+    if one is active. Inside collect() they are only gathered, so work done in
+    another process can hand them back to be recorded with record().
+    """
+    
+    def __init__(self, prefix: str = 'ros_checker'):
+        self.prefix = prefix
+        self._histograms = {}
+        self._gauges = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as one run of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def timed(self, name: str):
+        """Decorator timing every call of a function as one run of a stage"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def observe(self, name: str, seconds: float):
+        collector = getattr(self._local, 'collector', None)
+        if collector is not None:
+            collector.append((name, seconds))
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+        profile = getattr(self._local, 'profile', None)
+        if profile is not None:
+            profile.append((name, seconds))
+    
+    def record(self, timings: Iterable[Timing]):
+        """Record stage timings gathered elsewhere by collect()"""
+        for name, seconds in timings:
+            self.observe(name, seconds)
+    
+    @contextmanager
+    def collect(self):
+        """Gather this thread's stage timings into a list instead of recording them"""
+        previous = getattr(self._local, 'collector', None)
+        timings = self._local.collector = []
+        try:
+            yield timings
+        finally:
+            self._local.collector = previous
+    
+    @contextmanager
+    def profile(self):
+        """Keep a copy of this thread's stage timings for a per-request breakdown"""
+        previous = getattr(self._local, 'profile', None)
+        timings = self._local.profile = []
+        try:
+            yield timings
+        finally:
+            self._local.profile = previous
+    
+    def gauge(self, name: str, help_text: str, fn: Callable[[], float], kind: str = 'gauge'):
+        """Expose fn() as a metric, read each time the metrics are rendered"""
+        self._gauges.append((name, help_text, fn, kind))
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        name = f"{self.prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each processing stage",
+            f"# TYPE {name} histogram"
+        ]
+        with self._lock:
+            for stage in sorted(self._histograms):
+                histogram = self._histograms[stage]
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        
+        for gauge_name, help_text, fn, kind in self._gauges:
+            gauge_name = f"{self.prefix}_{gauge_name}"
+            lines.append(f"# HELP {gauge_name} {help_text}")
+            lines.append(f"# TYPE {gauge_name} {kind}")
+            lines.append(f"{gauge_name} {fn():g}")
+        return "\n".join(lines) + "\n"
+
+def summarize(timings: List[Timing]) -> Dict:
+    """Per-stage count and total seconds of a profile, in first-seen order"""
+    stages = {}
+    for name, seconds in timings:
+        stage = stages.setdefault(name, {"count": 0, "seconds": 0.0})
+        stage["count"] += 1
+        stage["seconds"] += seconds
+    for stage in stages.values():
+        stage["seconds"] = round(stage["seconds"], 6)
+    return {"stages": stages}
+
+# Shared by the app and the backend modules it drives
+metrics = Metrics()
\ No newline at end of file
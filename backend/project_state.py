@@ -0,0 +1,106 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from backend.result_cache import ResultCache, content_hash
+from backend.ros_graph import ROSGraph
+from backend.code_checker import CHECKER_VERSION
+from backend.workspace_checker import check_files, merge_reports, workspace_cpp_checker, workspace_key_fn
+
+class _PreviousRunCache:
+    """Serves reports of the project's previous run by key, then falls back to the shared cache"""
+    
+    def __init__(self, previous: Dict[str, Dict], fallback: Optional[ResultCache]):
+        self.previous = previous
+        self.fallback = fallback
+        self.reused = 0
+    
+    def get(self, key: str) -> Optional[Dict]:
+        report = self.previous.get(key)
+        if report is None and self.fallback is not None:
+            report = self.fallback.get(key)
+        if report is not None:
+            self.reused += 1
+        return report
+    
+    def set(self, key: str, report: Dict):
+        if self.fallback is not None:
+            self.fallback.set(key, report)
+
+class ProjectState:
+    """Per-file fingerprints and reports from the last check of each project
+
+    Stored in the result cache so they survive restarts; the ROS graph of recently
+    checked projects is kept in memory and updated only for the files that changed.
+    """
+    
+    def __init__(self, store: ResultCache, max_graphs: int = 32):
+        self.store = store
+        self.max_graphs = max_graphs
+        self._graphs = OrderedDict()
+        self._project_locks = {}
+        self._lock = threading.Lock()
+    
+    def load(self, project: str) -> Dict[str, Dict]:
+        """Return {relative path: {"key": ..., "report": ...}} from the project's last check"""
+        state = self.store.get(self._key(project))
+        return state["files"] if state else {}
+    
+    def save(self, project: str, files: Dict[str, Dict]):
+        self.store.set(self._key(project), {"project": project, "files": files})
+    
+    def graph(self, project: str) -> ROSGraph:
+        """The project's ROS graph as of its last check (empty if it has none in memory)"""
+        with self._lock:
+            graph = self._graphs.pop(project, None) or ROSGraph()
+            self._graphs[project] = graph
+            while len(self._graphs) > self.max_graphs:
+                self._graphs.popitem(last=False)
+            return graph
+    
+    def lock(self, project: str) -> threading.Lock:
+        """Lock serializing updates to one project's graph and saved state"""
+        with self._lock:
+            return self._project_locks.setdefault(project, threading.Lock())
+    
+    def _key(self, project: str) -> str:
+        return content_hash('project', CHECKER_VERSION, project)
+
+def check_workspace_incremental(file_paths: Iterable[str], root_dir: str, project: str, state: ProjectState,
+                                max_workers: Optional[int] = None, cache: Optional[ResultCache] = None,
+                                on_report: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+    """Re-check a project, analyzing only files whose contents or included headers changed
+
+    Every other file reuses its report from the project's previous run (or the shared
+    cache); the result is a complete workspace report, as from check_workspace.
+    """
+    previous = {entry["key"]: entry["report"] for entry in state.load(project).values()}
+    run_cache = _PreviousRunCache(previous, cache)
+    
+    keys = {}
+    workspace_key = workspace_key_fn(root_dir)
+    
+    def key_fn(path: str) -> str:
+        keys[path] = workspace_key(path)
+        return keys[path]
+    
+    file_reports = check_files(file_paths, max_workers, run_cache, on_report,
+                               lambda: workspace_cpp_checker(root_dir), root_dir, key_fn)
+    
+    files = {}
+    for path, report in file_reports.items():
+        rel_path = os.path.relpath(path, root_dir).replace(os.sep, '/')
+        files[rel_path] = {"key": keys[path], "report": report}
+    
+    with state.lock(project):
+        merged = merge_reports(file_reports, root_dir, state.graph(project))
+        state.save(project, files)
+    
+    merged["incremental"] = {
+        "project": project,
+        "files": len(file_reports),
+        "rechecked": len(file_reports) - run_cache.reused,
+        "reused": run_cache.reused
+    }
+    return merged
\ No newline at end of file
@@ -0,0 +1,120 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, GifImagePlugin
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+
+# One frame: (arm joint points as (M, 2), cube position, target position)
+FrameState = Tuple[np.ndarray, Sequence[float], Sequence[float]]
+
+class FrameRenderer:
+    """Draws simulation frames on one preconfigured figure, updating artist data in place
+
+    The static parts (axes, grid, title) are drawn once and cached; each frame only
+    restores that background and redraws the arm, cube and target artists.
+    """
+    
+    def __init__(self, figsize=(6, 6), dpi=100, xlim=(-0.5, 1.0), ylim=(-0.5, 1.0)):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        
+        # Plot robotic arm (simplified as lines), cube and target
+        self.arm_line, = self.ax.plot([], [], 'o-', lw=3, color='blue', animated=True)
+        self.cube_marker, = self.ax.plot([], [], 's', markersize=10, color='green', animated=True)
+        self.target_marker, = self.ax.plot([], [], 'x', markersize=10, color='red', animated=True)
+        
+        # Set axis limits
+        self.ax.set_xlim(*xlim)
+        self.ax.set_ylim(*ylim)
+        self.ax.set_aspect('equal')
+        self.ax.grid(True)
+        self.ax.set_title('Robotic Arm Simulation')
+        
+        self._background = None
+    
+    def render(self, arm_points: np.ndarray, cube: Sequence[float], target: Sequence[float]) -> Image.Image:
+        """Draw one frame and return it as an RGB image"""
+        if self._background is None:
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        
+        self.arm_line.set_data(arm_points[:, 0], arm_points[:, 1])
+        self.cube_marker.set_data([cube[0]], [cube[1]])
+        self.target_marker.set_data([target[0]], [target[1]])
+        
+        self.canvas.restore_region(self._background)
+        for artist in (self.arm_line, self.cube_marker, self.target_marker):
+            self.ax.draw_artist(artist)
+        
+        rgba = np.asarray(self.canvas.buffer_rgba())
+        return Image.fromarray(rgba[:, :, :3].copy())
+    
+    def render_png(self, arm_points: np.ndarray, cube: Sequence[float], target: Sequence[float]) -> bytes:
+        """Draw one frame and return it PNG-encoded"""
+        buf = io.BytesIO()
+        self.render(arm_points, cube, target).save(buf, format='PNG', compress_level=1)
+        return buf.getvalue()
+    
+    def write_sequence(self, states: Iterable[FrameState], out_dir: str, start: int = 0,
+                       gif_path: str = None, fps: float = 20.0) -> List[str]:
+        """Render frames one at a time to numbered PNG files, returning their file names
+        
+        With gif_path, the same frames are also assembled into an animated GIF.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        names = []
+        gif = open(gif_path, 'wb') if gif_path else None
+        palette = None
+        try:
+            for i, (arm_points, cube, target) in enumerate(states, start):
+                image = self.render(arm_points, cube, target)
+                name = frame_name(i)
+                image.save(os.path.join(out_dir, name), format='PNG', compress_level=1)
+                names.append(name)
+                if gif:
+                    # The scene only has a handful of colors, so one global palette fits every
+                    # frame, and each frame is appended to the file as soon as it is drawn
+                    if palette is None:
+                        palette = image.quantize(colors=64)
+                        header, _ = GifImagePlugin.getheader(palette, info={'loop': 0})
+                        gif.writelines(header)
+                    gif.writelines(GifImagePlugin.getdata(image.quantize(palette=palette),
+                                                          duration=int(1000 / fps)))
+            if gif and palette is not None:
+                gif.write(b';')  # GIF trailer
+        finally:
+            if gif:
+                gif.close()
+        if gif_path and palette is None:
+            os.remove(gif_path)
+        return names
+
+def frame_name(index: int) -> str:
+    return f"frame_{index:05d}.png"
+
+_idle_renderers = []
+_idle_renderers_lock = threading.Lock()
+
+@contextmanager
+def checkout_renderer() -> Iterator[FrameRenderer]:
+    """Borrow a shared renderer for the duration of a with block
+
+    A matplotlib figure must not be drawn from two threads at once, so each
+    concurrent user gets its own renderer; renderers are created only when all
+    existing ones are busy and are kept for reuse afterwards.
+    """
+    with _idle_renderers_lock:
+        renderer = _idle_renderers.pop() if _idle_renderers else None
+    if renderer is None:
+        renderer = FrameRenderer()
+    try:
+        yield renderer
+    finally:
+        with _idle_renderers_lock:
+            _idle_renderers.append(renderer)
\ No newline at end of file
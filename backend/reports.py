@@ -1,55 +1,102 @@
 import json
+import base64
 from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, Union
 
-def generate_text_report(check_report: dict, sim_report: dict = None) -> str:
-    """Generate a text report from the check and simulation results"""
-    report = []
-    report.append("=" * 50)
-    report.append("ROS Code Checker Report")
-    report.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report.append("=" * 50)
-    
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for the msgpack format
+    msgpack = None
+
+from backend.metrics import metrics
+
+# Streamable report formats and their content types
+REPORT_FORMATS = {
+    'text': 'text/plain; charset=utf-8',
+    'json': 'application/json',
+    'jsonl': 'application/x-ndjson',
+    'msgpack': 'application/msgpack'
+}
+
+def _check_sections(check_report: dict) -> Iterator[str]:
+    """Lines of the error, warning, ROS element and safety sections of a check report"""
     # Errors
     if check_report["errors"]:
-        report.append("\nERRORS:")
+        yield "\nERRORS:"
         for error in check_report["errors"]:
-            report.append(f"  - {error}")
+            yield f"  - {error}"
     else:
-        report.append("\nNo syntax errors found.")
+        yield "\nNo syntax errors found."
     
     # Warnings
     if check_report["warnings"]:
-        report.append("\nWARNINGS:")
+        yield "\nWARNINGS:"
         for warning in check_report["warnings"]:
-            report.append(f"  - {warning}")
+            yield f"  - {warning}"
     
     # ROS Elements
-    report.append("\nROS Elements Found:")
-    report.append(f"  - init_node: {'Yes' if check_report['ros_elements']['init_node'] else 'No'}")
+    yield "\nROS Elements Found:"
+    yield f"  - init_node: {'Yes' if check_report['ros_elements']['init_node'] else 'No'}"
     
     if check_report["ros_elements"]["publishers"]:
-        report.append(f"  - Publishers: {len(check_report['ros_elements']['publishers'])}")
+        yield f"  - Publishers: {len(check_report['ros_elements']['publishers'])}"
         for pub in check_report["ros_elements"]["publishers"]:
-            report.append(f"    * {pub['variable']} -> {pub['topic']}")
+            yield f"    * {pub['variable']} -> {pub['topic']}"
     
     if check_report["ros_elements"]["subscribers"]:
-        report.append(f"  - Subscribers: {len(check_report['ros_elements']['subscribers'])}")
+        yield f"  - Subscribers: {len(check_report['ros_elements']['subscribers'])}"
         for sub in check_report["ros_elements"]["subscribers"]:
-            report.append(f"    * {sub}")
+            yield f"    * {sub}"
     
     if check_report["ros_elements"]["services"]:
-        report.append(f"  - Services: {len(check_report['ros_elements']['services'])}")
+        yield f"  - Services: {len(check_report['ros_elements']['services'])}"
         for svc in check_report["ros_elements"]["services"]:
-            report.append(f"    * {svc['variable']} -> {svc['service']}")
+            yield f"    * {svc['variable']} -> {svc['service']}"
     
     # Safety Issues
     if check_report["safety_issues"]:
-        report.append("\nSafety Issues:")
+        yield "\nSafety Issues:"
         for issue in check_report["safety_issues"]:
-            report.append(f"  - {issue}")
+            yield f"  - {issue}"
+
+def iter_text_report(check_report: dict, sim_report: dict = None, file_count: int = None) -> Iterator[str]:
+    """Yield a text report section by section; join the sections with newlines
+    
+    file_count is the size of the whole workspace when check_report only holds one page of its files.
+    """
+    yield "\n".join([
+        "=" * 50,
+        "ROS Code Checker Report",
+        f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "=" * 50
+    ])
+    
+    if check_report.get("files"):
+        # Workspace report: summary followed by one section per file
+        yield "\n".join([
+            f"\nFiles checked: {file_count if file_count is not None else len(check_report['files'])}",
+            f"  - Errors: {len(check_report['errors'])}",
+            f"  - Warnings: {len(check_report['warnings'])}",
+            f"  - Safety issues: {len(check_report['safety_issues'])}"
+        ])
+        for file_name, file_report in check_report["files"].items():
+            yield "\n".join(["\n" + "-" * 50, f"File: {file_name}", "-" * 50, *_check_sections(file_report)])
+        
+        graph = check_report.get("graph")
+        if graph:
+            report = ["\n" + "-" * 50, "ROS Graph:", f"  - Topics: {len(graph['topics'])}"]
+            for topic, nodes in graph["topics"].items():
+                report.append(f"    * {topic}: {len(nodes['publishers'])} publisher(s), {len(nodes['subscribers'])} subscriber(s)")
+            report.append(f"  - Services: {len(graph['services'])}")
+            for service, nodes in graph["services"].items():
+                report.append(f"    * {service}: {', '.join(nodes['servers'])}")
+            yield "\n".join(report)
+    else:
+        yield "\n".join(_check_sections(check_report))
     
     # Simulation Results
     if sim_report:
+        report = []
         report.append("\nSimulation Results:")
         report.append(f"  - Success: {'Yes' if sim_report['success'] else 'No'}")
         report.append(f"  - Final Joint Positions:")
@@ -57,14 +104,127 @@ def generate_text_report(check_report: dict, sim_report: dict = None) -> str:
             report.append(f"    * {joint}: {value:.2f} rad")
         report.append(f"  - Final Cube Position: [{sim_report['cube_position'][0]:.2f}, {sim_report['cube_position'][1]:.2f}, {sim_report['cube_position'][2]:.2f}]")
         report.append(f"  - Target Position: [{sim_report['target_position'][0]:.2f}, {sim_report['target_position'][1]:.2f}, {sim_report['target_position'][2]:.2f}]")
+        for violation in sim_report.get("joint_limit_violations", []):
+            limits = f"[{_limit(violation['lower'])}, {_limit(violation['upper'])}]"
+            report.append(f"  - Joint limit: {violation['joint']} ({violation['model_joint']}) commanded "
+                          f"{violation['min']:.2f}..{violation['max']:.2f} rad outside {limits}, clamped")
+        
+        trajectory = sim_report.get("trajectory")
+        if trajectory:
+            report.append("\nTrajectory:")
+            report.append(f"  - Steps: {trajectory['steps']} at {trajectory['control_rate']:g} Hz ({trajectory['duration']:.2f} s)")
+            if trajectory["time_to_target"] is not None:
+                report.append(f"  - Time to target: {trajectory['time_to_target']:.2f} s")
+            else:
+                report.append("  - Time to target: never reached")
+            report.append(f"  - Closest approach to target: {trajectory['min_distance_to_target']:.3f}")
+            report.append("  - Max joint velocities:")
+            for joint, value in trajectory["max_joint_velocity"].items():
+                report.append(f"    * {joint}: {value:.2f} rad/s")
+        yield "\n".join(report)
+
+def _limit(value) -> str:
+    return f"{value:.2f}" if value is not None else "none"
+
+@metrics.timed('report.text')
+def generate_text_report(check_report: dict, sim_report: dict = None, file_count: int = None) -> str:
+    """Generate a text report from the check and simulation results"""
+    return "\n".join(iter_text_report(check_report, sim_report, file_count))
+
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+def _iter_json(check_report: dict, sim_report: dict = None, cache_key: str = None) -> Iterator[str]:
+    """Compact JSON report in chunks, one per workspace file"""
+    yield f'{{"timestamp":{_encode(datetime.now().isoformat())},"check_report":{{'
+    for i, (key, value) in enumerate(check_report.items()):
+        separator = ',' if i else ''
+        if key == "files":
+            yield f'{separator}"files":{{'
+            for j, (file_name, file_report) in enumerate(value.items()):
+                yield f'{"," if j else ""}{_encode(file_name)}:{_encode(file_report)}'
+            yield '}'
+        else:
+            yield f'{separator}{_encode(key)}:{_encode(value)}'
+    yield f'}},"simulation_report":{_encode(sim_report)}'
+    if cache_key:
+        yield f',"cache_key":{_encode(cache_key)}'
+    yield '}'
+
+def iter_report_records(check_report: dict, sim_report: dict = None, cache_key: str = None,
+                        binary_frames: bool = False) -> Iterator[Dict]:
+    """A report as a sequence of small records, for line-delimited JSON and msgpack
+    
+    Records are "report" (metadata), one "file" per workspace file, "check" (the check
+    report without its files), "simulation" (without frames) and one "frame" per frame.
+    Frames stored as files are referenced by frame_set and name; inline frames carry
+    their PNG data, as raw bytes when binary_frames is set and base64 otherwise.
+    """
+    record = {"type": "report", "timestamp": datetime.now().isoformat()}
+    if cache_key:
+        record["cache_key"] = cache_key
+    yield record
+    
+    files = check_report.get("files")
+    if files is not None:
+        for file_name, file_report in files.items():
+            yield {"type": "file", "file": file_name, "report": file_report}
+    yield {"type": "check", "report": {key: value for key, value in check_report.items() if key != "files"}}
     
-    return "\n".join(report)
+    if sim_report:
+        frames = sim_report.get("frames", [])
+        frame_set = sim_report.get("frame_set")
+        yield {"type": "simulation", "report": {key: value for key, value in sim_report.items() if key != "frames"},
+               "frames": len(frames)}
+        for index, frame in enumerate(frames):
+            if frame_set:
+                yield {"type": "frame", "index": index, "frame_set": frame_set, "name": frame}
+            else:
+                yield {"type": "frame", "index": index, "data": base64.b64decode(frame) if binary_frames else frame}
+
+def iter_report(check_report: dict, sim_report: dict = None, fmt: str = 'json',
+                cache_key: str = None) -> Iterator[Union[str, bytes]]:
+    """Report chunks in one of REPORT_FORMATS, to stream to a file or HTTP response
+    
+    msgpack yields bytes (one packed record per chunk, read back with msgpack.Unpacker);
+    the other formats yield text.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format {fmt!r}; use one of {', '.join(REPORT_FORMATS)}")
+    if fmt == 'msgpack' and msgpack is None:
+        raise ValueError("The msgpack report format needs the msgpack package")
+    
+    if fmt == 'text':
+        return (section + "\n" for section in iter_text_report(check_report, sim_report))
+    if fmt == 'json':
+        return _iter_json(check_report, sim_report, cache_key)
+    records = iter_report_records(check_report, sim_report, cache_key, binary_frames=fmt == 'msgpack')
+    if fmt == 'jsonl':
+        return (_encode(record) + "\n" for record in records)
+    return (msgpack.packb(record, use_bin_type=True) for record in records)
+
+def write_report(stream: BinaryIO, check_report: dict, sim_report: dict = None, fmt: str = 'json',
+                 cache_key: str = None) -> int:
+    """Write a report to a binary file chunk by chunk, returning the bytes written"""
+    written = 0
+    with metrics.stage(f'report.{fmt}'):
+        for chunk in iter_report(check_report, sim_report, fmt, cache_key):
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            stream.write(chunk)
+            written += len(chunk)
+    return written
 
-def generate_json_report(check_report: dict, sim_report: dict = None) -> str:
-    """Generate a JSON report from the check and simulation results"""
+@metrics.timed('report.json')
+def generate_json_report(check_report: dict, sim_report: dict = None, cache_key: str = None,
+                         pretty: bool = False) -> str:
+    """Generate a JSON report from the check and simulation results, compact unless pretty"""
+    if not pretty:
+        return "".join(_iter_json(check_report, sim_report, cache_key))
     full_report = {
         "timestamp": datetime.now().isoformat(),
         "check_report": check_report,
         "simulation_report": sim_report
     }
+    if cache_key:
+        full_report["cache_key"] = cache_key
     return json.dumps(full_report, indent=2)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+def content_hash(*parts) -> str:
+    """Return a SHA-256 hex digest over the given str/bytes parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def file_cache_key(file_path: str, version: str, context: str = '') -> str:
+    """Key a file's results by its contents, extension, checker version and context"""
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    extension = os.path.splitext(file_path)[1]
+    return content_hash(version, extension, context, content)
+
+class ResultCache:
+    """Two-level cache of JSON results: an in-memory LRU over an on-disk store"""
+    
+    def __init__(self, cache_dir: str, max_memory_items: int = 256, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return json.loads(data)
+        
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                data = f.read()
+            os.utime(path)  # Mark as recently used for disk eviction
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self._remember(key, data)
+            self.hits += 1
+        return json.loads(data)
+    
+    def set(self, key: str, value: Dict):
+        """Store a JSON-serializable result under key"""
+        data = json.dumps(value)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Write atomically so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._remember(key, data)
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data) - old_size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+    
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._memory.clear()
+            for path, _, _ in self._disk_entries():
+                os.remove(path)
+            self._disk_bytes = 0
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def _remember(self, key: str, data: str):
+        """Insert into the memory layer, evicting the least recently used entries"""
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+    
+    def _disk_entries(self):
+        """Yield (path, size, mtime) for every entry in the disk layer"""
+        for root, _, files in os.walk(self.cache_dir):
+            for f in files:
+                if f.endswith('.json'):
+                    path = os.path.join(root, f)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+    
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._disk_entries())
+    
+    def _evict_disk(self):
+        """Remove least recently used disk entries until below 90% of the size limit"""
+        target = self.max_disk_bytes * 0.9
+        for path, size, _ in sorted(self._disk_entries(), key=lambda entry: entry[2]):
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self._disk_bytes -= size
+            except OSError:
+                pass
\ No newline at end of file
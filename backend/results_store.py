@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    result_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    file_hash TEXT,
+    check_report TEXT NOT NULL,
+    simulation_report TEXT,
+    simulated_at REAL
+);
+CREATE INDEX IF NOT EXISTS results_file_hash ON results (file_hash);
+CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    job TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+"""
+
+class ResultsStore:
+    """Check and simulation results of each upload in an indexed SQLite database
+
+    Reports are stored structured, as JSON; text reports are rendered from them
+    when viewed. Results older than ttl_seconds are deleted by cleanup(), which
+    also runs on its own at most every cleanup_interval seconds while saving and
+    passes the deleted ids to on_expire.
+
+    The state of background jobs is kept here too, so every server process can
+    report on a job whichever process runs it.
+    """
+    
+    def __init__(self, db_path: str, ttl_seconds: float = 7 * 24 * 3600, cleanup_interval: float = 600,
+                 on_expire: Callable[[List[str]], None] = None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval = cleanup_interval
+        self.on_expire = on_expire
+        self._local = threading.local()
+        self._last_cleanup = 0.0
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread (and process, for forked workers) that opened them
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def save_check(self, result_id: str, check_report: Dict, file_hash: str = None):
+        """Store the check report of a new upload"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (result_id, created_at, file_hash, check_report) VALUES (?, ?, ?, ?)",
+                (result_id, time.time(), file_hash, json.dumps(check_report))
+            )
+        self._maybe_cleanup()
+    
+    def save_simulation(self, result_id: str, sim_report: Dict):
+        """Attach the latest simulation report to a stored result"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE results SET simulation_report = ?, simulated_at = ? WHERE result_id = ?",
+                (json.dumps(sim_report), time.time(), result_id)
+            )
+    
+    def get(self, result_id: str) -> Optional[Dict]:
+        """Return a stored result with its decoded reports, or None"""
+        row = self._connect().execute(
+            "SELECT * FROM results WHERE result_id = ? AND created_at >= ?",
+            (result_id, self._expiry())
+        ).fetchone()
+        return _decode(row) if row is not None else None
+    
+    def get_page(self, result_id: str, offset: int = 0, limit: int = 50) -> Optional[Dict]:
+        """Like get, but a workspace check report only holds files offset..offset+limit
+        
+        The page is cut out by SQLite, so large workspace reports are never decoded whole.
+        The record's file_count is the number of files in the whole report.
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT result_id, created_at, file_hash, json_remove(check_report, '$.files') AS check_report, "
+            "simulation_report, simulated_at, json_type(check_report, '$.files') AS files_type, "
+            "(SELECT COUNT(*) FROM json_each(check_report, '$.files')) AS file_count "
+            "FROM results WHERE result_id = ? AND created_at >= ?",
+            (result_id, self._expiry())
+        ).fetchone()
+        if row is None:
+            return None
+        
+        record = _decode(row)
+        record["file_count"] = row["file_count"]
+        if row["files_type"] == 'object':
+            files = conn.execute(
+                "SELECT files.key, files.value FROM results, json_each(results.check_report, '$.files') AS files "
+                "WHERE results.result_id = ? LIMIT ? OFFSET ?",
+                (result_id, limit, offset)
+            ).fetchall()
+            record["check_report"]["files"] = {key: json.loads(value) for key, value in files}
+        return record
+    
+    def exists(self, result_id: str) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM results WHERE result_id = ? AND created_at >= ?",
+            (result_id, self._expiry())
+        ).fetchone()
+        return row is not None
+    
+    def summaries(self, file_hash: str = None, since: float = None, until: float = None,
+                  limit: int = 100, offset: int = 0) -> List[Dict]:
+        """Error and warning counts of stored results, newest first, without decoding their reports"""
+        query = ("SELECT result_id, created_at, file_hash, json_array_length(check_report, '$.errors') AS errors, "
+                 "json_array_length(check_report, '$.warnings') AS warnings, "
+                 "simulation_report IS NOT NULL AS simulated FROM results WHERE created_at >= ? AND created_at < ?")
+        params = [max(since or 0.0, self._expiry()), until if until is not None else float('inf')]
+        if file_hash is not None:
+            query += " AND file_hash = ?"
+            params.append(file_hash)
+        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        rows = self._connect().execute(query, params + [limit, offset]).fetchall()
+        return [dict(row, simulated=bool(row["simulated"])) for row in rows]
+    
+    def save_job(self, job_id: str, version: int, job: Dict):
+        """Store the latest state of a background job; older versions never overwrite newer ones"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, version, updated_at, job) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET version = excluded.version, updated_at = excluded.updated_at, "
+                "job = excluded.job WHERE excluded.version > jobs.version",
+                (job_id, version, time.time(), json.dumps(job))
+            )
+    
+    def get_job(self, job_id: str) -> Optional[Tuple[int, Dict]]:
+        """Return the version and state of a stored job, or None"""
+        row = self._connect().execute(
+            "SELECT version, job FROM jobs WHERE job_id = ? AND updated_at >= ?",
+            (job_id, self._expiry())
+        ).fetchone()
+        return (row["version"], json.loads(row["job"])) if row is not None else None
+    
+    def cleanup(self) -> List[str]:
+        """Delete expired results and jobs, returning the result ids"""
+        expiry = self._expiry()
+        with self._connect() as conn:
+            expired = [row[0] for row in conn.execute("SELECT result_id FROM results WHERE created_at < ?", (expiry,))]
+            conn.execute("DELETE FROM results WHERE created_at < ?", (expiry,))
+            conn.execute("DELETE FROM jobs WHERE updated_at < ?", (expiry,))
+        self._last_cleanup = time.time()
+        if expired and self.on_expire:
+            self.on_expire(expired)
+        return expired
+    
+    def _maybe_cleanup(self):
+        if time.time() - self._last_cleanup >= self.cleanup_interval:
+            self.cleanup()
+    
+    def _expiry(self) -> float:
+        return time.time() - self.ttl_seconds
+
+def _decode(row: sqlite3.Row) -> Dict:
+    return {
+        "result_id": row["result_id"],
+        "created_at": row["created_at"],
+        "file_hash": row["file_hash"],
+        "check_report": json.loads(row["check_report"]),
+        "simulation_report": json.loads(row["simulation_report"]) if row["simulation_report"] else None,
+        "simulated_at": row["simulated_at"]
+    }
\ No newline at end of file
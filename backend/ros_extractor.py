@@ -0,0 +1,158 @@
+import re
+import ast
+from typing import Dict, List, Optional
+
+# Matches names like joint1_value, joint_2_values, JOINT3VALUE
+JOINT_NAME_PATTERN = re.compile(r'^joint[_\s]*(\w+?)[_\s]*values?$', re.IGNORECASE)
+
+# Same naming convention, for sources we cannot parse into an AST (C++)
+JOINT_ASSIGNMENT_PATTERN = re.compile(r'(joint[_\s]*\w+?[_\s]*values?)\s*=\s*([-\d.]+)', re.IGNORECASE)
+
+# rospy callables we track, with the positional index of their name argument
+ROSPY_CALLS = {
+    'init_node': 0,
+    'Publisher': 0,
+    'Subscriber': 0,
+    'Service': 0,
+}
+
+def joint_key(name: str) -> Optional[str]:
+    """Map a variable name such as 'joint_1_value' to its joint ('joint1'), or None"""
+    match = JOINT_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return 'joint' + match.group(1).lower()
+
+def find_joint_values(content: str) -> Dict[str, List[float]]:
+    """Collect joint value assignments from raw source text in one regex pass"""
+    joint_values = {}
+    for name, value in JOINT_ASSIGNMENT_PATTERN.findall(content):
+        joint = joint_key(name)
+        if joint is None:
+            continue
+        try:
+            joint_values.setdefault(joint, []).append(float(value))
+        except ValueError:
+            pass
+    return joint_values
+
+def _numeric_value(node: ast.AST) -> Optional[float]:
+    """Return the value of a numeric literal (optionally signed), or None"""
+    sign = 1.0
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        if isinstance(node.op, ast.USub):
+            sign = -1.0
+        node = node.operand
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return sign * float(node.value)
+    return None
+
+def _target_name(node: ast.AST) -> Optional[str]:
+    """Return the bound name of an assignment target (x or self.x), or None"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+def _string_value(node: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+class ROSElementExtractor(ast.NodeVisitor):
+    """Collect ROS constructs and joint assignments in a single pass over a Python AST"""
+    
+    def __init__(self):
+        self.rospy_modules = {'rospy'}  # names the rospy module is bound to
+        self.rospy_names = {}  # local name -> rospy attribute, from 'from rospy import ...'
+        self.elements = {
+            "publishers": [],
+            "subscribers": [],
+            "services": [],
+            "init_node": False
+        }
+        self.joint_values = {}
+        self._assigned_call = None
+        self._assigned_name = None
+    
+    def result(self) -> Dict:
+        """Return the collected ROS elements and joint values"""
+        return {
+            "ros_elements": self.elements,
+            "joint_values": self.joint_values
+        }
+    
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.name == 'rospy':
+                self.rospy_modules.add(alias.asname or alias.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module == 'rospy':
+            for alias in node.names:
+                self.rospy_names[alias.asname or alias.name] = alias.name
+    
+    def visit_Assign(self, node: ast.Assign):
+        value = _numeric_value(node.value)
+        if value is not None:
+            for target in node.targets:
+                self._record_joint(_target_name(target), value)
+        
+        if isinstance(node.value, ast.Call):
+            self._assigned_call = node.value
+            self._assigned_name = _target_name(node.targets[0])
+        self.generic_visit(node)
+    
+    def visit_Call(self, node: ast.Call):
+        for keyword in node.keywords:
+            if keyword.arg:
+                value = _numeric_value(keyword.value)
+                if value is not None:
+                    self._record_joint(keyword.arg, value)
+        
+        kind = self._rospy_call(node.func)
+        if kind == 'init_node':
+            self.elements["init_node"] = True
+        elif kind is not None:
+            name = self._call_argument(node, ROSPY_CALLS[kind], 'name')
+            variable = self._assigned_name if node is self._assigned_call else None
+            if name is not None:
+                if kind == 'Subscriber':
+                    self.elements["subscribers"].append(name)
+                elif kind == 'Publisher' and variable:
+                    self.elements["publishers"].append({"variable": variable, "topic": name})
+                elif kind == 'Service' and variable:
+                    self.elements["services"].append({"variable": variable, "service": name})
+        self.generic_visit(node)
+    
+    def _rospy_call(self, func: ast.AST) -> Optional[str]:
+        """Return the rospy callable a call refers to (through any alias), or None"""
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            if func.value.id in self.rospy_modules and func.attr in ROSPY_CALLS:
+                return func.attr
+        elif isinstance(func, ast.Name):
+            name = self.rospy_names.get(func.id)
+            if name in ROSPY_CALLS:
+                return name
+        return None
+    
+    def _call_argument(self, node: ast.Call, position: int, keyword: str) -> Optional[str]:
+        """Return a string argument given either positionally or by keyword"""
+        if len(node.args) > position:
+            return _string_value(node.args[position])
+        for kw in node.keywords:
+            if kw.arg == keyword:
+                return _string_value(kw.value)
+        return None
+    
+    def _record_joint(self, name: Optional[str], value: float):
+        joint = joint_key(name) if name else None
+        if joint is not None:
+            self.joint_values.setdefault(joint, []).append(value)
+
+def extract_ros_elements(tree: ast.AST) -> Dict:
+    """Run the extractor over a parsed module and return its result"""
+    extractor = ROSElementExtractor()
+    extractor.visit(tree)
+    return extractor.result()
\ No newline at end of file
@@ -0,0 +1,121 @@
+import json
+import hashlib
+from typing import Dict, List
+
+def topic_key(name: str) -> str:
+    """Resolve a topic or service name against the root namespace ('chatter' -> '/chatter')"""
+    if name.startswith(('/', '~')):
+        return name
+    return '/' + name
+
+def _fingerprint(elements: Dict) -> str:
+    return hashlib.sha256(json.dumps(elements, sort_keys=True).encode('utf-8')).hexdigest()
+
+class ROSGraph:
+    """Index of topics and services across the files of a workspace
+
+    Maps each topic to the files publishing and subscribing to it and each service
+    to the files advertising it. Files are added, replaced and removed one at a
+    time; only the topics and services a change touches are re-analyzed.
+    """
+    
+    def __init__(self):
+        self.publishers = {}  # topic -> {file: count}
+        self.subscribers = {}  # topic -> {file: count}
+        self.servers = {}  # service -> {file: count}
+        self._files = {}  # file -> (fingerprint, topics published, topics subscribed, services)
+        self._issues = {}  # ('topic' | 'service', name) -> issue messages
+        self._dirty = set()
+    
+    def update_file(self, file_name: str, ros_elements: Dict) -> bool:
+        """Index (or re-index) one file's ROS elements; return False if nothing changed"""
+        fingerprint = _fingerprint(ros_elements)
+        previous = self._files.get(file_name)
+        if previous is not None and previous[0] == fingerprint:
+            return False
+        self.remove_file(file_name)
+        
+        published = [topic_key(pub["topic"]) for pub in ros_elements["publishers"]]
+        subscribed = [topic_key(topic) for topic in ros_elements["subscribers"]]
+        services = [topic_key(svc["service"]) for svc in ros_elements["services"]]
+        self._add(self.publishers, published, file_name, 'topic')
+        self._add(self.subscribers, subscribed, file_name, 'topic')
+        self._add(self.servers, services, file_name, 'service')
+        self._files[file_name] = (fingerprint, published, subscribed, services)
+        return True
+    
+    def remove_file(self, file_name: str):
+        """Drop everything a file contributed to the graph"""
+        previous = self._files.pop(file_name, None)
+        if previous is None:
+            return
+        _, published, subscribed, services = previous
+        self._remove(self.publishers, published, file_name, 'topic')
+        self._remove(self.subscribers, subscribed, file_name, 'topic')
+        self._remove(self.servers, services, file_name, 'service')
+    
+    def sync(self, file_elements: Dict[str, Dict]) -> int:
+        """Make the graph match file_elements (file -> ros_elements), return how many files changed"""
+        changed = 0
+        for file_name in [f for f in self._files if f not in file_elements]:
+            self.remove_file(file_name)
+            changed += 1
+        for file_name, elements in file_elements.items():
+            if self.update_file(file_name, elements):
+                changed += 1
+        return changed
+    
+    def issues(self) -> List[str]:
+        """Dangling subscriptions, topics nobody subscribes to and duplicate services"""
+        for kind, name in self._dirty:
+            messages = self._analyze_topic(name) if kind == 'topic' else self._analyze_service(name)
+            if messages:
+                self._issues[(kind, name)] = messages
+            else:
+                self._issues.pop((kind, name), None)
+        self._dirty.clear()
+        return [message for key in sorted(self._issues) for message in self._issues[key]]
+    
+    def to_dict(self) -> Dict:
+        topics = sorted(set(self.publishers) | set(self.subscribers))
+        return {
+            "topics": {
+                topic: {
+                    "publishers": sorted(self.publishers.get(topic, {})),
+                    "subscribers": sorted(self.subscribers.get(topic, {}))
+                } for topic in topics
+            },
+            "services": {service: {"servers": sorted(files)} for service, files in sorted(self.servers.items())},
+            "issues": self.issues()
+        }
+    
+    def _analyze_topic(self, topic: str) -> List[str]:
+        publishers = self.publishers.get(topic)
+        subscribers = self.subscribers.get(topic)
+        if subscribers and not publishers:
+            return [f"Topic {topic} is subscribed to in {', '.join(sorted(subscribers))} but never published"]
+        if publishers and not subscribers:
+            return [f"Topic {topic} is published in {', '.join(sorted(publishers))} but has no subscribers"]
+        return []
+    
+    def _analyze_service(self, service: str) -> List[str]:
+        servers = self.servers.get(service, {})
+        if sum(servers.values()) > 1:
+            return [f"Service {service} is advertised more than once: {', '.join(sorted(servers))}"]
+        return []
+    
+    def _add(self, index: Dict[str, Dict[str, int]], names: List[str], file_name: str, kind: str):
+        for name in names:
+            files = index.setdefault(name, {})
+            files[file_name] = files.get(file_name, 0) + 1
+            self._dirty.add((kind, name))
+    
+    def _remove(self, index: Dict[str, Dict[str, int]], names: List[str], file_name: str, kind: str):
+        for name in names:
+            files = index[name]
+            files[file_name] -= 1
+            if not files[file_name]:
+                del files[file_name]
+            if not files:
+                del index[name]
+            self._dirty.add((kind, name))
\ No newline at end of file
@@ -0,0 +1,364 @@
+import re
+import ast
+from typing import Dict, List, Optional, Type
+
+SEVERITIES = ('info', 'warning', 'error')
+
+# Findings kept per rule and file, so output stays bounded on adversarial input
+MAX_FINDINGS_PER_RULE = 50
+
+# Calls that block or yield, so a loop containing one does not spin the CPU
+BLOCKING_CALLS = {'sleep', 'usleep', 'sleep_for', 'sleep_until', 'spin', 'wait', 'join',
+                  'wait_for_message', 'wait_for_service', 'waitForMessage', 'waitForService'}
+
+# Conditions of loops meant to run until the node shuts down
+CPP_FOREVER_CONDITIONS = {'(true)', '(1)', '(ros::ok())', '(;;)', '(!ros::isShuttingDown())'}
+
+# One alternative per token kind; none of them can backtrack past the current token
+CPP_TOKEN_PATTERN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*(?:[^*]|\*(?!/))*(?:\*/|$))
+  | (?P<preprocessor>\#[^\n]*)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<name>(?:::)?[A-Za-z_]\w*(?:::[A-Za-z_]\w*)*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>\S)
+''', re.VERBOSE)
+
+# Tokens of a statement header kept for rules to inspect; longer headers are truncated
+MAX_HEADER_TOKENS = 32
+
+_rules = {'python': {}, 'cpp': {}}
+
+def register_rule(rule_class: Type['SafetyRule']) -> Type['SafetyRule']:
+    """Class decorator adding a rule to the registry of its language"""
+    if rule_class.severity not in SEVERITIES:
+        raise ValueError(f"Unknown severity {rule_class.severity!r} for rule {rule_class.name}")
+    _rules[rule_class.language][rule_class.name] = rule_class
+    return rule_class
+
+def registered_rules(language: str) -> List[Type['SafetyRule']]:
+    return list(_rules[language].values())
+
+class SafetyRule:
+    """Base class for safety rules; a fresh instance checks each file
+
+    Python rules get enter/leave calls for the AST node types they list in
+    node_types; C++ rules get every token and the end of every block. Hooks
+    must do constant work per call so a check stays linear in file size.
+    """
+    
+    name = ''
+    language = 'python'
+    severity = 'warning'
+    message = ''
+    node_types = ()
+    
+    def __init__(self, findings: List[Dict]):
+        self._findings = findings
+        self._count = 0
+    
+    def report(self, line: int, message: str = None):
+        if self._count < MAX_FINDINGS_PER_RULE:
+            self._findings.append({
+                "rule": self.name,
+                "severity": self.severity,
+                "line": line,
+                "message": message or self.message
+            })
+        self._count += 1
+    
+    def enter(self, node: ast.AST, context: 'PythonContext'):
+        pass
+    
+    def leave(self, node: ast.AST, context: 'PythonContext'):
+        pass
+    
+    def token(self, token: 'Token', context: 'CppContext'):
+        pass
+    
+    def leave_block(self, block: 'Block', context: 'CppContext'):
+        pass
+
+class PythonContext:
+    """Scope information while walking a Python AST"""
+    
+    SCOPE_TYPES = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+    LOOP_TYPES = (ast.While, ast.For, ast.AsyncFor)
+    
+    def __init__(self):
+        self.scopes = []
+        self._loops = [[]]
+    
+    @property
+    def loops(self) -> List[ast.AST]:
+        """Loops enclosing the current node within its own function or class"""
+        return self._loops[-1]
+
+def check_python(tree: ast.AST, rules: List[Type[SafetyRule]] = None) -> List[Dict]:
+    """Run every Python rule over a parsed module in one traversal, returning findings"""
+    findings = []
+    instances = [rule(findings) for rule in (rules if rules is not None else registered_rules('python'))]
+    handlers = {}
+    for instance in instances:
+        for node_type in instance.node_types:
+            handlers.setdefault(node_type, []).append(instance)
+    
+    context = PythonContext()
+    stack = [(tree, False)]
+    while stack:
+        node, leaving = stack.pop()
+        node_rules = handlers.get(type(node), ())
+        if leaving:
+            for rule in node_rules:
+                rule.leave(node, context)
+            if isinstance(node, PythonContext.LOOP_TYPES):
+                context.loops.pop()
+            if isinstance(node, PythonContext.SCOPE_TYPES):
+                context.scopes.pop()
+                context._loops.pop()
+            continue
+        
+        if isinstance(node, PythonContext.SCOPE_TYPES):
+            context.scopes.append(node)
+            context._loops.append([])
+        if isinstance(node, PythonContext.LOOP_TYPES):
+            context.loops.append(node)
+        for rule in node_rules:
+            rule.enter(node, context)
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(list(ast.iter_child_nodes(node))))
+    return findings
+
+class Token:
+    __slots__ = ('kind', 'text', 'line')
+    
+    def __init__(self, kind: str, text: str, line: int):
+        self.kind = kind
+        self.text = text
+        self.line = line
+
+def _runs_forever_cpp(header: List[Token]) -> bool:
+    """while (true) / for (;;) and the other headers of loops meant to run until shutdown"""
+    keyword = header[0].text if header else ''
+    condition = ''.join(token.text for token in header[1:])
+    return keyword in ('while', 'for') and condition in CPP_FOREVER_CONDITIONS
+
+class Block:
+    """A C++ block and the statement header that opened it
+    
+    Blocks are brace-delimited, except the single-statement body of a loop
+    written without braces, which ends at the next top-level semicolon.
+    """
+    
+    def __init__(self, header: List[Token], line: int, braced: bool = True):
+        self.header = header
+        self.line = line
+        self.braced = braced
+        self.data = {}  # Per-rule state
+        self.keyword = header[0].text if header else ''
+        self.is_loop = self.keyword in ('while', 'for', 'do')
+        self.is_switch = self.keyword == 'switch'
+        # A do loop's condition follows its body; check_cpp sets it once read
+        self.is_forever = _runs_forever_cpp(header)
+
+class CppContext:
+    """Enclosing blocks while scanning a C++ token stream"""
+    
+    def __init__(self):
+        self.blocks = []
+        self.loops = []
+        self._break_targets = []  # Innermost loop or switch as of each open block
+    
+    def push(self, block: Block):
+        self.blocks.append(block)
+        if block.is_loop:
+            self.loops.append(block)
+        self._break_targets.append(block if block.is_loop or block.is_switch else self.break_target())
+    
+    def pop(self) -> Block:
+        block = self.blocks.pop()
+        if block.is_loop:
+            self.loops.pop()
+        self._break_targets.pop()
+        return block
+    
+    def innermost_loop(self) -> Optional[Block]:
+        return self.loops[-1] if self.loops else None
+    
+    def break_target(self) -> Optional[Block]:
+        """The innermost loop or switch, which a break statement leaves"""
+        return self._break_targets[-1] if self._break_targets else None
+
+def tokenize_cpp(content: str):
+    """Yield the code tokens of a C++ source, skipping comments and preprocessor lines"""
+    line = 1
+    position = 0
+    for match in CPP_TOKEN_PATTERN.finditer(content):
+        line += content.count('\n', position, match.start())
+        position = match.start()
+        kind = match.lastgroup
+        if kind not in ('comment', 'preprocessor'):
+            yield Token(kind, match.group(), line)
+
+def check_cpp(content: str, rules: List[Type[SafetyRule]] = None) -> List[Dict]:
+    """Run every C++ rule over a source's token stream in one pass, returning findings"""
+    findings = []
+    instances = [rule(findings) for rule in (rules if rules is not None else registered_rules('cpp'))]
+    context = CppContext()
+    header = []
+    paren_depth = 0
+    loop_header = False  # header is a while/for whose condition just closed
+    do_block = None  # Body of a do loop, waiting for its trailing while (...)
+    
+    def leave(block: Block):
+        for rule in instances:
+            rule.leave_block(block, context)
+    
+    def close_statements():
+        while context.blocks and not context.blocks[-1].braced:
+            leave(context.pop())
+    
+    for token in tokenize_cpp(content):
+        text = token.text
+        if loop_header:
+            loop_header = False
+            if text != '{':
+                context.push(Block(header, header[0].line, braced=False))
+                header = []
+        
+        for rule in instances:
+            rule.token(token, context)
+        
+        if do_block is not None and text in ('{', '}'):
+            leave(do_block)
+            do_block = None
+        if text == '{':
+            context.push(Block(header, token.line))
+            header = []
+            paren_depth = 0
+        elif text == '}':
+            close_statements()
+            if context.blocks:
+                block = context.pop()
+                if block.keyword == 'do':
+                    do_block = block
+                else:
+                    leave(block)
+            header = []
+            paren_depth = 0
+        elif text == ';' and paren_depth == 0:
+            if do_block is not None:
+                do_block.is_forever = _runs_forever_cpp(header)
+                leave(do_block)
+                do_block = None
+            close_statements()
+            header = []
+        else:
+            if text == '(':
+                paren_depth += 1
+            elif text == ')':
+                paren_depth = max(0, paren_depth - 1)
+                loop_header = (paren_depth == 0 and do_block is None and bool(header)
+                               and header[0].text in ('while', 'for'))
+            if len(header) < MAX_HEADER_TOKENS:
+                header.append(token)
+    return findings
+
+def format_finding(finding: Dict) -> str:
+    return f"{finding['severity']}: {finding['message']} (line {finding['line']})"
+
+def _call_name(func: ast.AST) -> Optional[str]:
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return None
+
+def _runs_forever(test: ast.AST) -> bool:
+    """while True / while 1 / while not rospy.is_shutdown()"""
+    if isinstance(test, ast.Constant):
+        return bool(test.value)
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not) and isinstance(test.operand, ast.Call):
+        return _call_name(test.operand.func) == 'is_shutdown'
+    return False
+
+@register_rule
+class BusyLoopRule(SafetyRule):
+    """while True / while not rospy.is_shutdown() loops that never sleep, block or break"""
+    
+    name = 'busy-loop'
+    severity = 'warning'
+    message = "Potential infinite loop without sleep detected"
+    node_types = (ast.While, ast.For, ast.AsyncFor, ast.Call, ast.Break)
+    
+    def __init__(self, findings: List[Dict]):
+        super().__init__(findings)
+        self.throttled = set()  # ids of loops that sleep or block
+        self.broken = set()  # ids of loops left through break
+    
+    def enter(self, node: ast.AST, context: PythonContext):
+        if not context.loops:
+            return
+        if isinstance(node, ast.Break):
+            self.broken.add(id(context.loops[-1]))
+        elif isinstance(node, ast.Call) and _call_name(node.func) in BLOCKING_CALLS:
+            self.throttled.add(id(context.loops[-1]))
+    
+    def leave(self, node: ast.AST, context: PythonContext):
+        if not isinstance(node, PythonContext.LOOP_TYPES):
+            return
+        if id(node) in self.throttled:
+            # A loop that sleeps also throttles every loop around it
+            if len(context.loops) > 1:
+                self.throttled.add(id(context.loops[-2]))
+        elif id(node) not in self.broken and isinstance(node, ast.While) and _runs_forever(node.test):
+            self.report(node.lineno)
+
+@register_rule
+class PublisherQueueSizeRule(SafetyRule):
+    """rospy.Publisher without queue_size, which publishes synchronously"""
+    
+    name = 'publisher-queue-size'
+    severity = 'info'
+    message = "rospy.Publisher created without queue_size publishes synchronously"
+    node_types = (ast.Call,)
+    
+    def enter(self, node: ast.Call, context: PythonContext):
+        if _call_name(node.func) != 'Publisher':
+            return
+        # queue_size is the seventh positional parameter
+        if len(node.args) < 7 and not any(keyword.arg in ('queue_size', None) for keyword in node.keywords):
+            self.report(node.lineno)
+
+@register_rule
+class CppBusyLoopRule(SafetyRule):
+    """while (true) / while (ros::ok()) / for (;;) loops that never sleep, block or break"""
+    
+    name = 'busy-loop'
+    language = 'cpp'
+    severity = 'warning'
+    message = "Potential infinite loop without sleep detected"
+    
+    def token(self, token: Token, context: CppContext):
+        if token.kind != 'name':
+            return
+        if token.text == 'break':
+            # A break inside a switch leaves the switch, not the loop around it
+            target = context.break_target()
+            if target is not None and target.is_loop:
+                target.data['broken'] = True
+        elif token.text.rsplit('::', 1)[-1] in BLOCKING_CALLS:
+            loop = context.innermost_loop()
+            if loop is not None:
+                loop.data['throttled'] = True
+    
+    def leave_block(self, block: Block, context: CppContext):
+        if not block.is_loop:
+            return
+        if block.data.get('throttled'):
+            # A loop that sleeps also throttles every loop around it
+            outer = context.innermost_loop()
+            if outer is not None:
+                outer.data['throttled'] = True
+        elif block.is_forever and not block.data.get('broken'):
+            self.report(block.line)
\ No newline at end of file
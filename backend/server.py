@@ -0,0 +1,161 @@
+"""Pre-forking production server: warm up shared state once, then fork workers that share it
+
+    python -m backend.server --workers 4 --port 8000
+
+Every worker serves requests on threads and reuses the renderer, fonts and compiled
+patterns prepared before the fork; the memory holding them stays shared with the
+parent until it is written to. Job state lives in the results database, so any
+worker can answer for a job that another one runs.
+"""
+import os
+import gc
+import sys
+import time
+import signal
+import socket
+import shutil
+import argparse
+import tempfile
+from typing import List
+
+from werkzeug.serving import make_server
+
+WARM_UP_PYTHON = """import rospy
+from std_msgs.msg import String
+
+rospy.init_node('warm_up')
+pub = rospy.Publisher('chatter', String, queue_size=10)
+joint1_value = 0.5
+rate = rospy.Rate(10)
+while not rospy.is_shutdown():
+    pub.publish(String(data='tick'))
+    rate.sleep()
+"""
+
+WARM_UP_CPP = """#include <ros/ros.h>
+#include <std_msgs/String.h>
+
+int main(int argc, char** argv) {
+  ros::init(argc, argv, "warm_up");
+  ros::NodeHandle n;
+  ros::Publisher pub = n.advertise<std_msgs::String>("chatter", 10);
+  ros::Subscriber sub = n.subscribe<std_msgs::String>("chatter", 10, callback);
+  double joint2_value = 0.5;
+  while (ros::ok()) {
+    ros::spinOnce();
+  }
+  return 0;
+}
+"""
+
+def warm_up(app):
+    """Load and initialize what workers would otherwise build on their first requests"""
+    from backend.code_checker import ROSCodeChecker
+    from backend.simulation_runner import SimulationRunner
+    
+    # Run both checkers once so lazily built state (pattern caches, rule registry) exists
+    work_dir = tempfile.mkdtemp(prefix='ros_checker_warm_up_')
+    try:
+        reports = []
+        for name, source in (('warm_up.py', WARM_UP_PYTHON), ('warm_up.cpp', WARM_UP_CPP)):
+            path = os.path.join(work_dir, name)
+            with open(path, 'w') as f:
+                f.write(source)
+            # A fake compiler result keeps g++ out of the warm-up
+            reports.append(ROSCodeChecker(cpp_results={path: (True, '')}).check_file(path))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    # One inline frame creates a pooled renderer, draws its figure template and loads its fonts, so
+    # each worker's first request reuses it; a configured robot model is parsed and its static
+    # transforms precomputed once for all workers
+    model = None
+    if app.config.get('ROBOT_MODEL'):
+        from backend.kinematics import load_model
+        model = load_model(app.config['ROBOT_MODEL'])
+    SimulationRunner(model=model).run_simulation("", reports[0])
+    
+    for template in app.jinja_env.list_templates():
+        app.jinja_env.get_template(template)
+
+def _serve_worker(app, sock: socket.socket):
+    """Serve requests on the shared listening socket until told to stop"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    host, port = sock.getsockname()[:2]
+    # Threaded, so long-lived event streams do not tie up a whole worker
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    server.serve_forever()
+
+def _spawn(app, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _serve_worker(app, sock)
+        finally:
+            os._exit(0)
+    return pid
+
+def serve(app, host: str = '127.0.0.1', port: int = 8000, workers: int = 4):
+    """Bind, warm up, fork workers and replace any that die until SIGTERM or SIGINT"""
+    if not hasattr(os, 'fork'):
+        raise RuntimeError("The pre-fork server needs os.fork; use 'python app.py' on this platform")
+    
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+    
+    start = time.perf_counter()
+    warm_up(app)
+    # Keep the garbage collector from touching (and so copying) everything loaded so far
+    gc.collect()
+    gc.freeze()
+    print(f" * Warmed up in {time.perf_counter() - start:.2f}s, serving on http://{host}:{port} "
+          f"with {workers} workers", file=sys.stderr)
+    
+    children = {_spawn(app, sock) for _ in range(workers)}
+    stopping = False
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f" * Worker {pid} exited, starting a new one", file=sys.stderr)
+            children.add(_spawn(app, sock))
+    sock.close()
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=os.environ.get('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument('-w', '--workers', type=int, default=int(os.environ.get('SERVER_WORKERS', os.cpu_count() or 1)),
+                        help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    from app import app
+    serve(app, args.host, args.port, args.workers)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -1,13 +1,27 @@
 import os
+import ast
 import json
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-import io
 import base64
+from typing import Iterator
+from backend.ros_extractor import extract_ros_elements, find_joint_values
+from backend.kinematics import RobotModel, dh_model
+from backend.metrics import metrics
+
+# Bump whenever the contents of a simulation report change, to invalidate cached results
+SIMULATION_VERSION = '1.3'
+
+JOINT_NAMES = ['joint1', 'joint2', 'joint3', 'joint4', 'joint5', 'joint6']
+ARM_LENGTH = 0.3  # Length of each drawn arm link
+TARGET_TOLERANCE = 0.1  # Cube must end within this distance of the target
+CUBE_START = (0.5, 0.5)  # Cube x/y before the arm moves it
+CUBE_REACH = 0.2  # How far joint1/joint2 can push the cube along x/y
+
+# Drawn arm when no robot model is configured: two planar links moved by joint1 and joint2
+PLANAR_ARM = dh_model('planar-2-link', [{"a": ARM_LENGTH}, {"a": ARM_LENGTH}])
 
 class SimulationRunner:
-    def __init__(self):
+    def __init__(self, frame_dir: str = None, model: RobotModel = None):
         self.joint_positions = {
             'joint1': 0,
             'joint2': 0,
@@ -20,108 +34,416 @@ class SimulationRunner:
         self.target_position = [0.7, 0.3, 0.0]  # Target position
         self.success = False
         self.frames = []
+        # When set, frames are written here as PNG files and self.frames holds their names;
+        # otherwise frames are kept inline as base64 strings
+        self.frame_dir = frame_dir
+        # With a robot model, joint1..joint6 drive its joints in order and the cube is carried
+        # by its end effector; without one the cube is pushed by joint1/joint2
+        self.model = model
+        if model is not None:
+            self._update_cube_position()
     
     def run_simulation(self, file_path: str, report: dict) -> dict:
         """Run a simplified simulation of the robotic arm"""
         # Extract joint movements from the code (simplified)
-        if file_path.endswith('.py'):
-            self._extract_joint_movements_from_python(file_path)
-        elif file_path.endswith('.cpp'):
-            self._extract_joint_movements_from_cpp(file_path)
+        self._apply_joint_values(self._extract_joint_values(file_path, report))
         
         # Generate simulation frames
         self._generate_frames()
         
         # Check if cube reached target
         distance = np.linalg.norm(np.array(self.cube_position[:2]) - np.array(self.target_position[:2]))
-        self.success = distance < 0.1
+        self.success = bool(distance < TARGET_TOLERANCE)
+        
+        return {
+            "success": self.success,
+            "frames": self.frames,
+            "joint_positions": self.joint_positions,
+            "cube_position": self.cube_position,
+            "target_position": self.target_position,
+            "robot_model": self.model.name if self.model else None,
+            "joint_limit_violations": self._limit_violations(self._joint_array())
+        }
+    
+    def run_trajectory(self, file_path: str, report: dict, control_rate: float = 100.0,
+                       max_joint_velocity: float = 1.0, max_output_steps: int = 1000,
+                       animation_frames: int = 0, animation_fps: float = 20.0, max_steps: int = None) -> dict:
+        """Simulate the whole motion: interpolate joint commands over time and track the cube
+        
+        Each successive assignment to a joint is a waypoint. Joints move together from
+        waypoint to waypoint, limited by max_joint_velocity (rad/s), sampled at control_rate
+        (Hz). Forward kinematics runs once over all timesteps as NumPy arrays.
+        animation_frames > 0 also renders that many evenly spaced frames. A motion that
+        would take more than max_steps steps raises ValueError before anything is allocated.
+        """
+        waypoints, waypoint_times, _ = self._plan_trajectory(file_path, report, control_rate,
+                                                             max_joint_velocity, max_steps)
+        times, trajectory = self._interpolate_waypoints(waypoints, waypoint_times, 1.0 / control_rate)
+        
+        cube = self._cube_positions(trajectory)
+        end_effector = self._link_positions(trajectory)[:, -1, :]
+        distance = np.linalg.norm(cube[:, :2] - np.asarray(self.target_position[:2]), axis=1)
+        reached = distance < TARGET_TOLERANCE
+        
+        if len(times) > 1:
+            joint_velocity = np.abs(np.diff(trajectory, axis=0)) * control_rate
+            max_velocity = joint_velocity.max(axis=0)
+        else:
+            max_velocity = np.zeros(len(JOINT_NAMES))
+        
+        # The final state is what run_simulation reports
+        for i, joint in enumerate(JOINT_NAMES):
+            self.joint_positions[joint] = float(trajectory[-1, i])
+        self.cube_position = [float(v) for v in cube[-1]]
+        self.success = bool(reached[-1])
+        
+        animation = None
+        if animation_frames > 0:
+            animation = self._write_animation(trajectory, cube, animation_frames, animation_fps)
+        
+        stride = 1
+        if max_output_steps and len(times) > max_output_steps:
+            stride = int(np.ceil(len(times) / max_output_steps))
         
         return {
             "success": self.success,
             "frames": self.frames,
             "joint_positions": self.joint_positions,
             "cube_position": self.cube_position,
-            "target_position": self.target_position
+            "target_position": self.target_position,
+            "robot_model": self.model.name if self.model else None,
+            "joint_limit_violations": self._limit_violations(waypoints),
+            "trajectory": {
+                "control_rate": control_rate,
+                "steps": len(times),
+                "duration": float(times[-1]),
+                "time_to_target": float(times[np.argmax(reached)]) if reached.any() else None,
+                "min_distance_to_target": float(distance.min()),
+                "max_joint_velocity": {joint: float(v) for joint, v in zip(JOINT_NAMES, max_velocity)},
+                "output_stride": stride,
+                "time": times[::stride].round(6).tolist(),
+                "cube_positions": cube[::stride].round(6).tolist(),
+                "end_effector_positions": end_effector[::stride].round(6).tolist(),
+                "animation": animation
+            }
         }
     
-    def _extract_joint_movements_from_python(self, file_path: str):
+    def stream_trajectory(self, file_path: str, report: dict, control_rate: float = 100.0,
+                          max_joint_velocity: float = 1.0, chunk_steps: int = 100, frame_every: int = 0,
+                          max_steps: int = None) -> Iterator[dict]:
+        """Simulate the motion of run_trajectory chunk by chunk, yielding events as they are computed
+        
+        Events are "start", then "states" with up to chunk_steps timesteps (times, joint
+        angles, drawn arm points seen from above and cube positions), a "frame" with an
+        inline PNG for every frame_every-th step when frame_every > 0, and finally "done"
+        with the final state. Only the current chunk is held in memory. Arguments are
+        checked before the first event, so invalid ones raise ValueError right away.
+        """
+        if chunk_steps < 1 or frame_every < 0:
+            raise ValueError("chunk_steps must be positive and frame_every not negative")
+        
+        waypoints, waypoint_times, steps = self._plan_trajectory(file_path, report, control_rate,
+                                                                 max_joint_velocity, max_steps)
+        return self._stream_states(waypoints, waypoint_times, 1.0 / control_rate, steps, chunk_steps, frame_every)
+    
+    def _stream_states(self, waypoints: np.ndarray, waypoint_times: np.ndarray, dt: float, steps: int,
+                       chunk_steps: int, frame_every: int) -> Iterator[dict]:
+        duration = float(waypoint_times[-1]) if steps > 1 else 0.0
+        yield {
+            "type": "start",
+            "steps": steps,
+            "duration": duration,
+            "control_rate": 1.0 / dt,
+            "joint_names": JOINT_NAMES,
+            "target_position": self.target_position,
+            "robot_model": self.model.name if self.model else None
+        }
+        
+        time_to_target = None
+        min_distance = np.inf
+        for start in range(0, steps, chunk_steps):
+            with metrics.stage('simulate.stream'):
+                times = np.minimum(np.arange(start, min(start + chunk_steps, steps)) * dt, duration)
+                joints = self._sample_waypoints(waypoints, waypoint_times, times)
+                cube = self._cube_positions(joints)
+                points = self._arm_points(joints)
+                distance = np.linalg.norm(cube[:, :2] - np.asarray(self.target_position[:2]), axis=1)
+                reached = distance < TARGET_TOLERANCE
+            if time_to_target is None and reached.any():
+                time_to_target = float(times[np.argmax(reached)])
+            min_distance = min(min_distance, float(distance.min()))
+            yield {
+                "type": "states",
+                "start": start,
+                "time": times.round(6).tolist(),
+                "joints": joints.round(6).tolist(),
+                "points": points.round(4).tolist(),
+                "cube": cube.round(4).tolist()
+            }
+            
+            if frame_every:
+                from backend.rendering import checkout_renderer
+                for step in range(-(-start // frame_every) * frame_every, start + len(times), frame_every):
+                    with checkout_renderer() as renderer:
+                        png = renderer.render_png(points[step - start], cube[step - start], self.target_position)
+                    yield {"type": "frame", "step": step, "data": base64.b64encode(png).decode('utf-8')}
+        
+        for i, joint in enumerate(JOINT_NAMES):
+            self.joint_positions[joint] = float(joints[-1, i])
+        self.cube_position = [float(v) for v in cube[-1]]
+        self.success = bool(reached[-1])
+        yield {
+            "type": "done",
+            "success": self.success,
+            "joint_positions": self.joint_positions,
+            "cube_position": self.cube_position,
+            "time_to_target": time_to_target,
+            "min_distance_to_target": min_distance,
+            "joint_limit_violations": self._limit_violations(waypoints)
+        }
+    
+    def run_monte_carlo(self, file_path: str, report: dict, scenarios: int = 1000,
+                        cube_noise: float = 0.02, link_noise: float = 0.05, joint_noise: float = 0.02,
+                        seed: int = None, worst_cases: int = 5) -> dict:
+        """Check whether the commanded motion still reaches the target under perturbations
+        
+        Every scenario perturbs the initial cube position (std dev cube_noise), the link
+        lengths (relative std dev link_noise) and the final joint angles (std dev
+        joint_noise, rad). All scenarios go through one vectorized kinematics pass.
+        """
+        if scenarios < 1:
+            raise ValueError("scenarios must be at least 1")
+        if worst_cases < 0:
+            raise ValueError("worst_cases must not be negative")
+        if not all(np.isfinite(level) and level >= 0 for level in (cube_noise, link_noise, joint_noise)):
+            raise ValueError("Noise levels must be finite and not negative")
+        
+        self._apply_joint_values(self._extract_joint_values(file_path, report))
+        nominal = self._joint_array()[0]
+        
+        rng = np.random.default_rng(seed)
+        joints = nominal + rng.normal(0.0, joint_noise, (scenarios, len(JOINT_NAMES)))
+        link_scale = np.clip(1.0 + rng.normal(0.0, link_noise, scenarios), 0.0, None)
+        cube_start = np.asarray(CUBE_START) + rng.normal(0.0, cube_noise, (scenarios, 2))
+        
+        cube = self._cube_positions(joints, cube_start, link_scale)
+        distance = np.linalg.norm(cube[:, :2] - np.asarray(self.target_position[:2]), axis=1)
+        success = distance < TARGET_TOLERANCE
+        
+        nominal_distance = float(np.linalg.norm(np.asarray(self.cube_position[:2]) - np.asarray(self.target_position[:2])))
+        counts, edges = np.histogram(distance, bins=20)
+        worst = np.argsort(distance)[::-1][:worst_cases]
+        
+        return {
+            "scenarios": scenarios,
+            "success_rate": float(success.mean()),
+            "nominal": {
+                "success": nominal_distance < TARGET_TOLERANCE,
+                "distance": nominal_distance,
+                "joint_positions": self.joint_positions,
+                "joint_limit_violations": self._limit_violations(nominal[None, :])
+            },
+            "parameters": {
+                "cube_noise": cube_noise,
+                "link_noise": link_noise,
+                "joint_noise": joint_noise,
+                "seed": seed,
+                "robot_model": self.model.name if self.model else None
+            },
+            "distance": {
+                "mean": float(distance.mean()),
+                "std": float(distance.std()),
+                "min": float(distance.min()),
+                "max": float(distance.max()),
+                "percentiles": {str(p): float(v) for p, v in zip((5, 25, 50, 75, 95), np.percentile(distance, (5, 25, 50, 75, 95)))},
+                "histogram": {"bin_edges": edges.round(6).tolist(), "counts": counts.tolist()}
+            },
+            "worst_cases": [
+                {
+                    "scenario": int(i),
+                    "distance": float(distance[i]),
+                    "joint_positions": {joint: float(v) for joint, v in zip(JOINT_NAMES, joints[i])},
+                    "link_scale": float(link_scale[i]),
+                    "cube_start": cube_start[i].tolist(),
+                    "cube_position": cube[i].tolist()
+                }
+                for i in worst
+            ]
+        }
+    
+    def _extract_joint_values(self, file_path: str, report: dict) -> dict:
+        """Return every joint's assigned values, from the source file or the check report"""
+        if file_path.endswith('.py'):
+            return self._extract_joint_movements_from_python(file_path)
+        elif file_path.endswith('.cpp'):
+            return self._extract_joint_movements_from_cpp(file_path)
+        # Reuse the joint values the code checker already extracted
+        return report.get("joint_values", {})
+    
+    def _extract_joint_movements_from_python(self, file_path: str) -> dict:
         """Extract joint movements from Python code (simplified)"""
         with open(file_path, 'r') as f:
             content = f.read()
         
-        # Look for joint value assignments (simplified pattern matching)
-        joint_assignments = {}
-        for joint in self.joint_positions.keys():
-            pattern = rf'{joint}[_\s]*value[s]*\s*=\s*([-\d.]+)'
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                joint_assignments[joint] = float(matches[-1])  # Take the last assignment
-        
-        # Update joint positions
-        self.joint_positions.update(joint_assignments)
-        
-        # Simple forward kinematics to determine cube position (simplified)
-        self._update_cube_position()
+        try:
+            return extract_ros_elements(ast.parse(content))["joint_values"]
+        except SyntaxError:
+            return find_joint_values(content)
     
-    def _extract_joint_movements_from_cpp(self, file_path: str):
+    def _extract_joint_movements_from_cpp(self, file_path: str) -> dict:
         """Extract joint movements from C++ code (simplified)"""
         with open(file_path, 'r') as f:
             content = f.read()
         
-        # Look for joint value assignments (simplified pattern matching)
-        joint_assignments = {}
-        for joint in self.joint_positions.keys():
-            pattern = rf'{joint}[_\s]*value[s]*\s*=\s*([-\d.]+)'
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                joint_assignments[joint] = float(matches[-1])  # Take the last assignment
-        
-        # Update joint positions
-        self.joint_positions.update(joint_assignments)
+        return find_joint_values(content)
+    
+    def _apply_joint_values(self, joint_values: dict):
+        """Set each known joint to its last assigned value"""
+        for joint, values in joint_values.items():
+            if joint in self.joint_positions and values:
+                self.joint_positions[joint] = values[-1]  # Take the last assignment
         
         # Simple forward kinematics to determine cube position (simplified)
         self._update_cube_position()
     
+    def _joint_waypoints(self, joint_values: dict) -> np.ndarray:
+        """Stack joint commands into (K, 6) waypoints, starting from the current pose
+        
+        Waypoint k uses each joint's k-th assignment; joints with fewer assignments hold
+        their last value.
+        """
+        start = [float(self.joint_positions[joint]) for joint in JOINT_NAMES]
+        count = max([len(joint_values.get(joint, [])) for joint in JOINT_NAMES] + [0])
+        waypoints = np.tile(np.asarray(start, dtype=float), (count + 1, 1))
+        for i, joint in enumerate(JOINT_NAMES):
+            values = joint_values.get(joint, [])
+            if values:
+                waypoints[1:len(values) + 1, i] = values
+                waypoints[len(values) + 1:, i] = values[-1]
+        return waypoints
+    
+    def trajectory_steps(self, file_path: str, report: dict, control_rate: float = 100.0,
+                         max_joint_velocity: float = 1.0) -> int:
+        """Number of control steps run_trajectory would simulate, without simulating them"""
+        return self._plan_trajectory(file_path, report, control_rate, max_joint_velocity)[2]
+    
+    def _plan_trajectory(self, file_path: str, report: dict, control_rate: float, max_joint_velocity: float,
+                         max_steps: int = None):
+        """Waypoints, the times they are reached and the number of control steps, checked against max_steps"""
+        if not (np.isfinite(control_rate) and np.isfinite(max_joint_velocity)) or control_rate <= 0 or max_joint_velocity <= 0:
+            raise ValueError("control_rate and max_joint_velocity must be positive and finite")
+        
+        waypoints = self._joint_waypoints(self._extract_joint_values(file_path, report))
+        waypoint_times = self._waypoint_times(waypoints, control_rate, max_joint_velocity)
+        dt = 1.0 / control_rate
+        # Same sampling as _interpolate_waypoints: np.arange(0, duration + dt / 2, dt)
+        steps = np.ceil((waypoint_times[-1] + dt / 2) / dt)
+        if not np.isfinite(steps) or (max_steps and steps > max_steps):
+            raise ValueError(f"The motion takes {steps:.3g} steps at this control_rate; the limit is {max_steps}")
+        return waypoints, waypoint_times, int(steps)
+    
+    def _interpolate_waypoints(self, waypoints: np.ndarray, waypoint_times: np.ndarray, dt: float):
+        """Sample a velocity-limited linear interpolation of the waypoints every dt seconds"""
+        if len(waypoints) == 1:
+            return np.zeros(1), waypoints.copy()
+        
+        times = np.arange(0.0, waypoint_times[-1] + dt / 2, dt)
+        times[-1] = min(times[-1], waypoint_times[-1])
+        return times, self._sample_waypoints(waypoints, waypoint_times, times)
+    
+    def _waypoint_times(self, waypoints: np.ndarray, control_rate: float, max_joint_velocity: float) -> np.ndarray:
+        """Time at which each waypoint is reached when joints move at most max_joint_velocity"""
+        dt = 1.0 / control_rate
+        segment_durations = np.abs(np.diff(waypoints, axis=0)).max(axis=1, initial=0.0) / max_joint_velocity
+        segment_durations = np.maximum(segment_durations, dt)
+        return np.concatenate([[0.0], np.cumsum(segment_durations)])
+    
+    def _sample_waypoints(self, waypoints: np.ndarray, waypoint_times: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """(len(times), 6) joint angles of the linear interpolation at the given times"""
+        trajectory = np.empty((len(times), waypoints.shape[1]))
+        for i in range(waypoints.shape[1]):
+            trajectory[:, i] = np.interp(times, waypoint_times, waypoints[:, i])
+        return trajectory
+    
+    def _cube_positions(self, joints: np.ndarray, cube_start=CUBE_START, link_scale=None) -> np.ndarray:
+        """Cube positions for an (N, 6) array of joint angles
+        
+        cube_start may be an (N, 2) array and link_scale an (N,) array to vary them per row.
+        With a robot model the cube sits at the end effector, offset by cube_start - CUBE_START.
+        """
+        cube_start = np.asarray(cube_start, dtype=float).reshape(-1, 2)
+        if self.model is not None:
+            tool = self._link_positions(joints, link_scale)[:, -1]
+            cube = tool.copy()
+            cube[:, :2] += cube_start - np.asarray(CUBE_START)
+            return cube
+        
+        # Without a model joint1 and joint2 push the cube along x and y
+        reach = CUBE_REACH * np.asarray(link_scale if link_scale is not None else 1.0, dtype=float).reshape(-1)
+        cube = np.empty((len(joints), 3))
+        cube[:, 0] = cube_start[:, 0] + reach * np.sin(joints[:, 0])
+        cube[:, 1] = cube_start[:, 1] + reach * np.sin(joints[:, 1])
+        cube[:, 2] = self.cube_position[2]
+        return cube
+    
+    def _link_positions(self, joints: np.ndarray, link_scale=None) -> np.ndarray:
+        """(N, P, 3) joint and tool positions of the robot model (or planar arm) for (N, 6) joint angles"""
+        model = self.model or PLANAR_ARM
+        return model.positions(model.joint_values(joints), link_scale)
+    
+    def _arm_points(self, joints: np.ndarray) -> np.ndarray:
+        """(N, P, 2) drawn arm points, seen from above"""
+        return self._link_positions(joints)[:, :, :2]
+    
+    def _limit_violations(self, joints: np.ndarray) -> list:
+        """Commanded joints outside the robot model's limits; the model clamps them to the limits"""
+        if self.model is None:
+            return []
+        return self.model.limit_violations(joints, JOINT_NAMES)
+    
+    def _joint_array(self) -> np.ndarray:
+        """Current joint positions as a (1, 6) array"""
+        return np.array([[float(self.joint_positions[joint]) for joint in JOINT_NAMES]])
+    
     def _update_cube_position(self):
         """Update cube position based on joint angles (simplified forward kinematics)"""
-        # This is a very simplified version - real forward kinematics would be more complex
-        # Just using joint1 and joint2 for x and y positioning
-        self.cube_position[0] = 0.5 + 0.2 * np.sin(self.joint_positions['joint1'])
-        self.cube_position[1] = 0.5 + 0.2 * np.sin(self.joint_positions['joint2'])
+        self.cube_position = [float(v) for v in self._cube_positions(self._joint_array())[0]]
     
+    @metrics.timed('simulate.frames')
     def _generate_frames(self):
         """Generate visualization frames for the simulation"""
-        # Create a simple 2D visualization
-        fig, ax = plt.subplots(figsize=(6, 6))
-        
-        # Plot robotic arm (simplified as lines)
-        arm_length = 0.3
-        x = [0, arm_length * np.cos(self.joint_positions['joint1']), 
-             arm_length * np.cos(self.joint_positions['joint1']) + arm_length * np.cos(self.joint_positions['joint1'] + self.joint_positions['joint2'])]
-        y = [0, arm_length * np.sin(self.joint_positions['joint1']), 
-             arm_length * np.sin(self.joint_positions['joint1']) + arm_length * np.sin(self.joint_positions['joint1'] + self.joint_positions['joint2'])]
-        
-        ax.plot(x, y, 'o-', lw=3, color='blue')
-        
-        # Plot cube
-        ax.plot(self.cube_position[0], self.cube_position[1], 's', markersize=10, color='green')
-        
-        # Plot target
-        ax.plot(self.target_position[0], self.target_position[1], 'x', markersize=10, color='red')
-        
-        # Set axis limits
-        ax.set_xlim(-0.5, 1.0)
-        ax.set_ylim(-0.5, 1.0)
-        ax.set_aspect('equal')
-        ax.grid(True)
-        ax.set_title('Robotic Arm Simulation')
-        
-        # Convert plot to base64 string
-        canvas = FigureCanvas(fig)
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png')
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
-        
-        self.frames.append(img_base64)
\ No newline at end of file
+        points = self._arm_points(self._joint_array())[0]
+        self._add_frame(points, self.cube_position)
+    
+    def _add_frame(self, arm_points: np.ndarray, cube_position):
+        """Render one frame with the shared renderer and store it"""
+        from backend.rendering import checkout_renderer, frame_name  # matplotlib loads on the first frame
+        with checkout_renderer() as renderer:
+            png = renderer.render_png(arm_points, cube_position, self.target_position)
+        if self.frame_dir:
+            os.makedirs(self.frame_dir, exist_ok=True)
+            name = frame_name(len(self.frames))
+            with open(os.path.join(self.frame_dir, name), 'wb') as f:
+                f.write(png)
+            self.frames.append(name)
+        else:
+            self.frames.append(base64.b64encode(png).decode('utf-8'))
+    
+    @metrics.timed('simulate.animation')
+    def _write_animation(self, trajectory: np.ndarray, cube: np.ndarray, frame_count: int, fps: float) -> dict:
+        """Render evenly spaced trajectory steps as PNG frames plus an animated GIF"""
+        indices = np.unique(np.linspace(0, len(trajectory) - 1, frame_count).round().astype(int))
+        arm_points = self._arm_points(trajectory[indices])
+        
+        animation = {"frames": len(indices), "fps": fps, "steps": indices.tolist()}
+        if self.frame_dir:
+            states = ((arm_points[i], cube[index], self.target_position) for i, index in enumerate(indices))
+            gif_path = os.path.join(self.frame_dir, 'animation.gif')
+            from backend.rendering import checkout_renderer
+            with checkout_renderer() as renderer:
+                self.frames.extend(renderer.write_sequence(states, self.frame_dir, len(self.frames), gif_path, fps))
+            animation["gif"] = 'animation.gif'
+        else:
+            for i, index in enumerate(indices):
+                self._add_frame(arm_points[i], cube[index])
+        return animation
\ No newline at end of file
@@ -0,0 +1,219 @@
+import os
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.code_checker import ROSCodeChecker, new_report, check_cache_key
+from backend.result_cache import ResultCache, content_hash
+from backend.cpp_checker import CppSyntaxChecker, get_cpp_checker
+from backend.ros_graph import ROSGraph
+from backend.dependencies import HeaderIndex, find_include_dirs
+from backend.metrics import metrics
+
+SOURCE_EXTENSIONS = ('.py', '.cpp')
+
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+
+def find_source_files(root_dir: str) -> List[str]:
+    """Return every Python and C++ source file under root_dir, in a stable order"""
+    source_files = []
+    for root, dirs, files in os.walk(root_dir):
+        dirs.sort()
+        for f in sorted(files):
+            if f.endswith(SOURCE_EXTENSIONS):
+                source_files.append(os.path.join(root, f))
+    return source_files
+
+def workspace_cpp_checker(root_dir: str) -> CppSyntaxChecker:
+    """C++ checker using the workspace's include dirs and its compile_commands.json, if any
+
+    The workspace's own compilation database is untrusted: only include paths inside the
+    workspace, macros and -std= are taken from it. Without one, the server-configured
+    COMPILE_COMMANDS applies in full.
+    """
+    uploaded = os.path.join(root_dir, 'compile_commands.json')
+    if not os.path.exists(uploaded):
+        uploaded = None
+    include_dirs = find_include_dirs(root_dir)
+    if uploaded is None and not include_dirs:
+        return get_cpp_checker()
+    checker = CppSyntaxChecker(compile_commands=None if uploaded else os.environ.get('COMPILE_COMMANDS') or None,
+                               include_dirs=include_dirs, root_dir=root_dir)
+    if uploaded:
+        try:
+            checker.load_compile_commands(uploaded, root_dir=root_dir)
+        except (OSError, ValueError, TypeError):
+            pass  # A broken database in an upload only costs its flags
+    return checker
+
+def _check_single_file(file_path: str, cpp_result: Optional[Tuple[bool, str]] = None,
+                       root_dir: Optional[str] = None) -> Tuple[Dict, List[Tuple[str, float]]]:
+    """Check one file with a fresh checker (runs inside a pool worker)
+    
+    Returns the report and the stage timings, for the parent process to record.
+    """
+    cpp_results = {file_path: cpp_result} if cpp_result is not None else None
+    with metrics.collect() as timings:
+        report = ROSCodeChecker(cpp_results, root_dir).check_file(file_path)
+    return report, timings
+
+def _get_executor(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    """Return the shared worker pool, recreating it if the size changed"""
+    global _executor, _executor_workers
+    # Concurrent first uploads and job threads must not each start a pool
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=max_workers)
+            _executor_workers = max_workers
+        return _executor
+
+def start_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Start the shared worker pool now instead of on the first check"""
+    return _get_executor(max_workers)
+
+def shutdown_pool():
+    """Stop the shared worker pool"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+            _executor_workers = None
+
+atexit.register(shutdown_pool)
+
+def check_files(file_paths: Iterable[str], max_workers: Optional[int] = None,
+                cache: Optional[ResultCache] = None,
+                on_report: Optional[Callable[[str, Dict], None]] = None,
+                cpp_checker_factory: Callable[[], CppSyntaxChecker] = get_cpp_checker,
+                root_dir: Optional[str] = None,
+                key_fn: Callable[[str], str] = check_cache_key) -> Dict[str, Dict]:
+    """Check files concurrently on a process pool, returning a report per path
+    
+    file_paths may be a generator: Python files are submitted to the pool as they
+    arrive, C++ files are syntax-checked together in batches once the input is exhausted,
+    on the compiler pool of the checker cpp_checker_factory returns at that point.
+    on_report(path, report) is called for every file as soon as its report is ready.
+    Cached reports are looked up under key_fn(path).
+    """
+    file_reports = {}
+    cache_keys = {}
+    
+    def finish(path: str, report: Dict, timings: List[Tuple[str, float]] = ()):
+        metrics.record(timings)
+        file_reports[path] = report
+        if path in cache_keys:
+            cache.set(cache_keys[path], report)
+        if on_report is not None:
+            on_report(path, report)
+    
+    executor = _get_executor(max_workers) if max_workers != 1 else None
+    futures = {}
+    cpp_paths = []
+    for path in file_paths:
+        # Serve unchanged files from the cache and only check the rest
+        if cache is not None:
+            key = key_fn(path)
+            cached = cache.get(key)
+            if cached is not None:
+                finish(path, cached)
+                continue
+            cache_keys[path] = key
+        
+        if path.endswith('.cpp'):
+            cpp_paths.append(path)
+        elif executor is None:
+            finish(path, *_check_single_file(path, None, root_dir))
+        else:
+            futures[executor.submit(_check_single_file, path, None, root_dir)] = path
+    
+    if cpp_paths:
+        with metrics.stage('cpp.syntax'):
+            cpp_results = cpp_checker_factory().check_many(cpp_paths)
+        for path in cpp_paths:
+            if executor is None:
+                finish(path, *_check_single_file(path, cpp_results[path], root_dir))
+            else:
+                futures[executor.submit(_check_single_file, path, cpp_results[path], root_dir)] = path
+    
+    for future in as_completed(futures):
+        path = futures[future]
+        try:
+            report, timings = future.result()
+        except Exception as e:
+            report, timings = new_report(), ()
+            report["errors"].append(f"Error checking file: {str(e)}")
+        finish(path, report, timings)
+    return file_reports
+
+def merge_reports(file_reports: Dict[str, Dict], root_dir: str, graph: Optional[ROSGraph] = None) -> Dict:
+    """Merge per-file reports into one workspace report with per-file sections
+    
+    The files' topics and services are linked into a ROS graph; pass the graph of a
+    previous check of the same workspace to re-analyze only the files that changed.
+    """
+    merged = new_report()
+    merged["files"] = {}
+    
+    if not file_reports:
+        merged["warnings"].append("No Python or C++ source files found in the upload.")
+        return merged
+    
+    for path in sorted(file_reports):
+        rel_path = os.path.relpath(path, root_dir).replace(os.sep, '/')
+        report = file_reports[path]
+        merged["files"][rel_path] = report
+        
+        for error in report["errors"]:
+            merged["errors"].append(f"{rel_path}: {error}")
+        for warning in report["warnings"]:
+            merged["warnings"].append(f"{rel_path}: {warning}")
+        for issue in report["safety_issues"]:
+            merged["safety_issues"].append(f"{rel_path}: {issue}")
+        
+        elements = report["ros_elements"]
+        if elements["init_node"]:
+            merged["ros_elements"]["init_node"] = True
+        for pub in elements["publishers"]:
+            merged["ros_elements"]["publishers"].append(dict(pub, file=rel_path))
+        merged["ros_elements"]["subscribers"].extend(elements["subscribers"])
+        for svc in elements["services"]:
+            merged["ros_elements"]["services"].append(dict(svc, file=rel_path))
+        for joint, values in report.get("joint_values", {}).items():
+            merged["joint_values"].setdefault(joint, []).extend(values)
+    
+    graph = graph if graph is not None else ROSGraph()
+    graph.sync({rel_path: report["ros_elements"] for rel_path, report in merged["files"].items()})
+    merged["graph"] = graph.to_dict()
+    merged["warnings"].extend(merged["graph"]["issues"])
+    return merged
+
+def workspace_key_fn(root_dir: str) -> Callable[[str], str]:
+    """Per-file cache key function for a workspace, aware of package roots and included headers"""
+    headers = HeaderIndex(root_dir)
+    return lambda path: check_cache_key(path, root_dir, headers)
+
+def workspace_cache_key(file_paths: Iterable[str], root_dir: str,
+                        key_fn: Optional[Callable[[str], str]] = None) -> str:
+    """Cache key for a whole workspace report: every file's key and relative path"""
+    key_fn = key_fn or workspace_key_fn(root_dir)
+    parts = []
+    for path in sorted(file_paths):
+        rel_path = os.path.relpath(path, root_dir).replace(os.sep, '/')
+        parts.extend([rel_path, key_fn(path)])
+    return content_hash('workspace', *parts)
+
+def check_workspace(file_paths: Iterable[str], root_dir: str, max_workers: Optional[int] = None,
+                    cache: Optional[ResultCache] = None,
+                    on_report: Optional[Callable[[str, Dict], None]] = None,
+                    graph: Optional[ROSGraph] = None) -> Dict:
+    """Check every source file of a package or workspace and merge the results"""
+    # Built lazily: headers and compile_commands.json may still be streaming in
+    file_reports = check_files(file_paths, max_workers, cache, on_report,
+                               lambda: workspace_cpp_checker(root_dir), root_dir, workspace_key_fn(root_dir))
+    return merge_reports(file_reports, root_dir, graph)
\ No newline at end of file
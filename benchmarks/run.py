@@ -0,0 +1,182 @@
+"""Time the checker, upload handling, simulation and reports on synthetic ROS workloads
+
+    python -m benchmarks.run --files 200 --output results.json
+    python -m benchmarks.run --files 200 --compare baseline.json --threshold 0.2
+"""
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from werkzeug.datastructures import FileStorage
+
+from backend.metrics import metrics
+from backend.code_checker import ROSCodeChecker
+from backend.file_handler import handle_upload, handle_workspace_upload, cleanup_temp_dir
+from backend.workspace_checker import check_workspace
+from backend.simulation_runner import SimulationRunner
+from backend.reports import generate_text_report, generate_json_report
+from benchmarks.workloads import python_node, cpp_node, workspace_files, write_workspace, workspace_zip
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict:
+    """Run fn repeat times, returning the median and best wall time and median per-stage times"""
+    durations = []
+    stage_runs = []
+    for _ in range(repeat):
+        with metrics.profile() as timings:
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+        stages = {}
+        for name, seconds in timings:
+            stages[name] = stages.get(name, 0.0) + seconds
+        stage_runs.append(stages)
+    
+    names = sorted({name for stages in stage_runs for name in stages})
+    return {
+        "median": statistics.median(durations),
+        "min": min(durations),
+        "runs": repeat,
+        "stages": {name: statistics.median(stages.get(name, 0.0) for stages in stage_runs) for name in names}
+    }
+
+def _upload(data: bytes, filename: str) -> FileStorage:
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+def run_benchmarks(args: argparse.Namespace) -> Dict:
+    work_dir = tempfile.mkdtemp(prefix='ros_checker_bench_')
+    shape = dict(publishers=args.publishers, joints=args.joints, nesting=args.nesting, seed=args.seed)
+    results = {}
+    try:
+        # Single files, checked in-process
+        python_path = f"{work_dir}/node.py"
+        with open(python_path, 'w') as f:
+            f.write(python_node(0, **shape))
+        results["check_file.python"] = measure(lambda: ROSCodeChecker().check_file(python_path), args.repeat)
+        
+        if shutil.which('g++') and not args.skip_cpp:
+            cpp_path = f"{work_dir}/node.cpp"
+            with open(cpp_path, 'w') as f:
+                f.write(cpp_node(0, **shape))
+            results["check_file.cpp"] = measure(lambda: ROSCodeChecker().check_file(cpp_path), args.repeat)
+        
+        # Uploads
+        contents = workspace_files(args.files, cpp_share=0.0 if args.skip_cpp else args.cpp_share, **shape)
+        archive = workspace_zip(contents)
+        single = python_node(1, **shape).encode('utf-8')
+        
+        def upload_file():
+            cleanup_temp_dir(handle_upload(_upload(single, 'node.py'))[1])
+        
+        def upload_workspace():
+            cleanup_temp_dir(handle_workspace_upload(_upload(archive, 'workspace.zip'))[1])
+        
+        results["handle_upload.file"] = measure(upload_file, args.repeat)
+        results["handle_upload.workspace"] = measure(upload_workspace, args.repeat)
+        
+        # Whole workspace, on the process pool and without the result cache
+        workspace_dir = f"{work_dir}/workspace"
+        sources = write_workspace(workspace_dir, contents)
+        workspace_report = check_workspace(sources, workspace_dir, args.workers)  # Warms up the pool
+        results["check_workspace"] = measure(lambda: check_workspace(sources, workspace_dir, args.workers),
+                                             args.repeat)
+        
+        # Simulation and reports
+        file_report = ROSCodeChecker().check_file(python_path)
+        sim_report = {}
+        
+        def simulate():
+            sim_report.update(SimulationRunner(frame_dir=f"{work_dir}/frames").run_simulation("", file_report))
+        
+        results["run_simulation"] = measure(simulate, args.repeat)
+        results["generate_text_report"] = measure(lambda: generate_text_report(workspace_report, sim_report),
+                                                  args.repeat)
+        results["generate_json_report"] = measure(lambda: generate_json_report(workspace_report, sim_report),
+                                                  args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {key: value for key, value in vars(args).items()
+                           if key not in ('output', 'compare', 'threshold', 'min_time')}
+        },
+        "benchmarks": results
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_time: float) -> Tuple[List[str], List[str]]:
+    """Benchmarks whose median wall time grew by more than threshold over the baseline, and
+    the stages that did
+
+    Only wall times count as regressions: stage times are summed over parallel workers
+    and vary too much between runs, so their changes are for information.
+    """
+    regressions = []
+    stage_changes = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        timings = [(regressions, name, result["median"], base["median"])]
+        for stage, seconds in result["stages"].items():
+            if stage in base["stages"]:
+                timings.append((stage_changes, f"{name} [{stage}]", seconds, base["stages"][stage]))
+        for found, label, seconds, base_seconds in timings:
+            # Ignore timings too short to compare reliably
+            if max(seconds, base_seconds) < min_time:
+                continue
+            if seconds > base_seconds * (1 + threshold):
+                found.append(f"{label}: {base_seconds * 1000:.2f} ms -> {seconds * 1000:.2f} ms "
+                             f"(+{(seconds / base_seconds - 1) * 100:.0f}%)")
+    return regressions, stage_changes
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=100, help="source files in the synthetic workspace")
+    parser.add_argument('--publishers', type=int, default=4, help="publishers per file")
+    parser.add_argument('--joints', type=int, default=6, help="joint assignments per file")
+    parser.add_argument('--nesting', type=int, default=2, help="loop nesting depth per file")
+    parser.add_argument('--cpp-share', type=float, default=0.2, help="share of C++ files in the workspace")
+    parser.add_argument('--skip-cpp', action='store_true', help="do not benchmark C++ (no g++ needed)")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size for workspace checks")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write results as JSON to this file (default: stdout)")
+    parser.add_argument('--compare', help="baseline results JSON; exit 1 when a benchmark's wall time regressed")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown, e.g. 0.2 = 20%%")
+    parser.add_argument('--min-time', type=float, default=0.005, help="ignore timings below this (seconds)")
+    args = parser.parse_args(argv)
+    
+    results = run_benchmarks(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions, stage_changes = compare(results, baseline, args.threshold, args.min_time)
+        for change in stage_changes:
+            print(f"SLOWER STAGE {change}", file=sys.stderr)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,118 @@
+import io
+import os
+import random
+import zipfile
+from typing import Dict, List
+
+PACKAGE_XML = """<?xml version="1.0"?>
+<package format="2">
+  <name>{name}</name>
+  <version>0.0.1</version>
+  <description>Synthetic benchmark package</description>
+  <maintainer email="bench@example.com">bench</maintainer>
+  <license>MIT</license>
+  <buildtool_depend>catkin</buildtool_depend>
+</package>
+"""
+
+CMAKE_LISTS = """cmake_minimum_required(VERSION 3.0.2)
+project({name})
+find_package(catkin REQUIRED COMPONENTS roscpp rospy std_msgs)
+catkin_package()
+"""
+
+def python_node(index: int, publishers: int = 4, joints: int = 6, nesting: int = 2, seed: int = 0) -> str:
+    """Source of a synthetic rospy node"""
+    rng = random.Random(seed * 100003 + index)
+    lines = [
+        "import rospy",
+        "from std_msgs.msg import String, Float64",
+        "",
+        f"rospy.init_node('node_{index}')",
+    ]
+    for p in range(publishers):
+        lines.append(f"pub_{p} = rospy.Publisher('topic_{(index + p) % 97}', String, queue_size=10)")
+        lines.append(f"rospy.Subscriber('topic_{(index + p + 1) % 97}', String, lambda msg: None)")
+    lines.append("")
+    for j in range(joints):
+        lines.append(f"joint{j % 6 + 1}_value = {rng.uniform(-3.5, 3.5):.3f}")
+    lines.append("")
+    lines.append("rate = rospy.Rate(10)")
+    lines.append("while not rospy.is_shutdown():")
+    indent = "    "
+    for level in range(nesting):
+        lines.append(f"{indent}for i_{level} in range({level + 2}):")
+        indent += "    "
+    for p in range(publishers):
+        lines.append(f"{indent}pub_{p}.publish(String(data='tick'))")
+    lines.append("    rate.sleep()")
+    return "\n".join(lines) + "\n"
+
+def cpp_node(index: int, publishers: int = 4, joints: int = 6, nesting: int = 2, seed: int = 0) -> str:
+    """Source of a synthetic roscpp node; it only needs the ROS headers to compile"""
+    rng = random.Random(seed * 100003 + index)
+    lines = [
+        "#include <ros/ros.h>",
+        "#include <std_msgs/String.h>",
+        "",
+        "int main(int argc, char** argv) {",
+        f"  ros::init(argc, argv, \"node_{index}\");",
+        "  ros::NodeHandle n;",
+    ]
+    for p in range(publishers):
+        lines.append(f"  ros::Publisher pub_{p} = n.advertise<std_msgs::String>(\"topic_{(index + p) % 97}\", 10);")
+    for j in range(joints):
+        lines.append(f"  double joint{j % 6 + 1}_value = {rng.uniform(-3.5, 3.5):.3f};")
+    lines.append("  ros::Rate loop_rate(10);")
+    lines.append("  while (ros::ok()) {")
+    indent = "    "
+    for level in range(nesting):
+        lines.append(f"{indent}for (int i_{level} = 0; i_{level} < {level + 2}; ++i_{level}) {{")
+        indent += "  "
+    for p in range(publishers):
+        lines.append(f"{indent}std_msgs::String msg_{p}; msg_{p}.data = \"tick\"; pub_{p}.publish(msg_{p});")
+    for level in range(nesting):
+        indent = indent[:-2]
+        lines.append(f"{indent}}}")
+    lines.append("    ros::spinOnce();")
+    lines.append("    loop_rate.sleep();")
+    lines.append("  }")
+    lines.append("  return 0;")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def workspace_files(files: int = 100, files_per_package: int = 10, cpp_share: float = 0.0,
+                    publishers: int = 4, joints: int = 6, nesting: int = 2, seed: int = 0) -> Dict[str, str]:
+    """Relative path -> contents of a synthetic catkin workspace"""
+    contents = {}
+    cpp_files = int(round(files * cpp_share))
+    for index in range(files):
+        package = f"pkg_{index // files_per_package}"
+        if index % files_per_package == 0:
+            contents[f"src/{package}/package.xml"] = PACKAGE_XML.format(name=package)
+            contents[f"src/{package}/CMakeLists.txt"] = CMAKE_LISTS.format(name=package)
+        if index < cpp_files:
+            contents[f"src/{package}/src/node_{index}.cpp"] = cpp_node(index, publishers, joints, nesting, seed)
+        else:
+            contents[f"src/{package}/scripts/node_{index}.py"] = python_node(index, publishers, joints, nesting, seed)
+    return contents
+
+def write_workspace(root_dir: str, contents: Dict[str, str]) -> List[str]:
+    """Write a workspace to disk, returning the paths of its source files"""
+    sources = []
+    for rel_path, text in contents.items():
+        path = os.path.join(root_dir, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        if path.endswith(('.py', '.cpp')):
+            sources.append(path)
+    return sorted(sources)
+
+def workspace_zip(contents: Dict[str, str]) -> bytes:
+    """A workspace packed as an in-memory ZIP archive, as a client would upload it"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for rel_path, text in contents.items():
+            archive.writestr(rel_path, text)
+    return buffer.getvalue()
\ No newline at end of file
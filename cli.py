@@ -0,0 +1,181 @@
+"""Check ROS sources, package directories and ZIP archives from the command line
+
+Every checked file is written to stdout as one JSON line as soon as its report is
+ready, followed by a summary line per input:
+
+    python cli.py ~/catkin_ws/src other_ws.zip node.py -j 8 > results.jsonl
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from backend.file_handler import iter_workspace_upload, cleanup_temp_dir, UploadRejected
+from backend.workspace_checker import (SOURCE_EXTENSIONS, check_files, merge_reports, find_source_files,
+                                       workspace_cpp_checker, workspace_key_fn, start_pool)
+from backend.result_cache import ResultCache
+from backend.reports import write_report, REPORT_FORMATS
+
+REPORT_EXTENSIONS = {'text': 'txt', 'json': 'json', 'jsonl': 'jsonl', 'msgpack': 'msgpack'}
+
+class JsonLinesWriter:
+    """Writes one JSON object per line, safely from several threads"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+    
+    def write(self, record: Dict):
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+def output_names(sources: List[str]) -> List[str]:
+    """Report and frame directory names per input, unique even when inputs share a base name"""
+    bases = [os.path.basename(os.path.normpath(source)) or 'report' for source in sources]
+    names = []
+    for base, source in zip(bases, sources):
+        if bases.count(base) > 1:
+            # e.g. a/src and b/src: tell them apart by a hash of the full path
+            base = f"{base}-{hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:8]}"
+        while base in names:  # The same input given twice
+            base = f"{base}-{names.count(base) + 1}"
+        names.append(base)
+    return names
+
+def check_input(source: str, name: str, args: argparse.Namespace, writer: JsonLinesWriter,
+                cache: Optional[ResultCache]) -> bool:
+    """Check one directory, archive or source file; return False if any file had errors
+
+    name is used for the input's report file and frames directory.
+    """
+    temp_dir = None
+    try:
+        if source.endswith('.zip'):
+            try:
+                archive = open(source, 'rb')
+            except OSError as e:
+                writer.write({"type": "error", "source": source, "error": f"Cannot read archive: {e.strerror or e}"})
+                return False
+            temp_dir = tempfile.mkdtemp(prefix='ros_checker_')
+            root_dir = temp_dir
+            file_paths = iter_workspace_upload(archive, temp_dir)
+        elif os.path.isdir(source):
+            archive = None
+            root_dir = source
+            file_paths = find_source_files(source)
+        elif source.endswith(SOURCE_EXTENSIONS) and os.path.isfile(source):
+            archive = None
+            root_dir = os.path.dirname(source) or '.'
+            file_paths = [source]
+        else:
+            writer.write({"type": "error", "source": source, "error": "Not a directory, ZIP archive or source file"})
+            return False
+        
+        def on_report(path: str, report: Dict):
+            writer.write({
+                "type": "file",
+                "source": source,
+                "file": os.path.relpath(path, root_dir).replace(os.sep, '/'),
+                "report": report
+            })
+        
+        try:
+            file_reports = check_files(file_paths, args.jobs, cache, on_report,
+                                       lambda: workspace_cpp_checker(root_dir), root_dir, workspace_key_fn(root_dir))
+        except UploadRejected as e:
+            writer.write({"type": "error", "source": source, "error": str(e)})
+            return False
+        finally:
+            if archive is not None:
+                archive.close()
+        
+        workspace_report = merge_reports(file_reports, root_dir)
+        writer.write({
+            "type": "summary",
+            "source": source,
+            "name": name,
+            "files": len(file_reports),
+            "errors": len(workspace_report["errors"]),
+            "warnings": len(workspace_report["warnings"]),
+            "safety_issues": len(workspace_report["safety_issues"]),
+            "graph_issues": workspace_report.get("graph", {}).get("issues", [])
+        })
+        
+        sim_report = None
+        if args.simulate:
+            sim_report = simulate(workspace_report, name, args.frames_dir, args.robot_model)
+            writer.write({"type": "simulation", "source": source, "sim_report": sim_report})
+        
+        if args.reports:
+            extension = REPORT_EXTENSIONS[args.report_format]
+            with open(os.path.join(args.reports, f"{name}.{extension}"), 'wb') as f:
+                write_report(f, workspace_report, sim_report, args.report_format)
+        
+        return not workspace_report["errors"]
+    finally:
+        if temp_dir:
+            cleanup_temp_dir(temp_dir)
+
+def simulate(check_report: Dict, name: str, frames_dir: Optional[str], robot_model: Optional[str]) -> Dict:
+    """Simulate a checked input; frames go to frames_dir/name when set, otherwise inline"""
+    # Imported here: the simulation pulls in NumPy and matplotlib, which most runs never need
+    from backend.simulation_runner import SimulationRunner
+    from backend.kinematics import load_model
+    frame_dir = os.path.join(frames_dir, name) if frames_dir else None
+    model = load_model(robot_model) if robot_model else None
+    sim_report = SimulationRunner(frame_dir=frame_dir, model=model).run_simulation("", check_report)
+    if frame_dir:
+        sim_report["frame_set"] = name
+    return sim_report
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="directories, .zip archives or .py/.cpp files")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="checker processes (default: one per CPU)")
+    parser.add_argument('--inputs-in-parallel', type=int, default=4,
+                        help="inputs fed to the checker processes at once")
+    parser.add_argument('--simulate', action='store_true', help="also simulate each input")
+    parser.add_argument('--reports', metavar='DIR', help="write a report per input to DIR")
+    parser.add_argument('--report-format', choices=list(REPORT_FORMATS), default='text',
+                        help="format of the --reports files (msgpack needs the msgpack package)")
+    parser.add_argument('--robot-model', metavar='FILE', help="URDF or DH .json robot model to simulate")
+    parser.add_argument('--frames-dir', metavar='DIR',
+                        help="write simulation frames to DIR/<input> and reference them by name")
+    parser.add_argument('--cache-dir', help="reuse results for unchanged files across runs")
+    args = parser.parse_args(argv)
+    
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.report_format == 'msgpack':
+        try:
+            import msgpack  # noqa: F401
+        except ImportError:
+            parser.error("--report-format msgpack needs the msgpack package")
+    if args.robot_model:
+        from backend.kinematics import load_model
+        try:
+            load_model(args.robot_model)
+        except (OSError, ValueError) as e:
+            parser.error(f"--robot-model: {e}")
+    if args.reports:
+        os.makedirs(args.reports, exist_ok=True)
+    cache = ResultCache(args.cache_dir) if args.cache_dir else None
+    writer = JsonLinesWriter(sys.stdout)
+    
+    if args.jobs != 1:
+        start_pool(args.jobs)
+    names = output_names(args.inputs)
+    with ThreadPoolExecutor(max_workers=max(1, min(args.inputs_in_parallel, len(args.inputs)))) as feeders:
+        results = list(feeders.map(lambda source, name: check_input(source, name, args, writer, cache),
+                                   args.inputs, names))
+    return 0 if all(results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
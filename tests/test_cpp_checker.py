@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+
+from backend import cpp_checker
+from backend.cpp_checker import CppSyntaxChecker, _parse_compile_command
+
+def test_trusted_database_keeps_parse_flags(tmp_path):
+    entry = {"directory": str(tmp_path), "file": "src/node.cpp",
+             "command": "g++ -Iinclude -isystem /opt/ros/noetic/include -DFOO=1 -std=c++17 -fPIC -O2 -c src/node.cpp"}
+    path, flags = _parse_compile_command(entry)
+    assert path == os.path.join(str(tmp_path), 'src', 'node.cpp')
+    assert flags == ['-I', os.path.join(str(tmp_path), 'include'), '-isystem', '/opt/ros/noetic/include',
+                     '-D', 'FOO=1', '-std=c++17', '-fPIC']
+
+def test_uploaded_database_is_confined_to_the_workspace(tmp_path):
+    root = tmp_path / 'ws'
+    (root / 'pkg' / 'include').mkdir(parents=True)
+    (tmp_path / 'outside').symlink_to('/etc')
+    entry = {"directory": "build", "file": "/home/dev/ws/pkg/src/node.cpp", "arguments": [
+        "g++", "-include", "/etc/passwd", "-fplugin=/tmp/evil.so", "-march=native", "-I/etc",
+        "-I", str(root / 'pkg' / 'include'), "-I../pkg/include", "-I../../outside", "-isystem", str(root / '..'),
+        "-DFOO=1", "-UBAR", "-std=c++17", "-c", "node.cpp"]}
+    _, flags = _parse_compile_command(entry, str(root))
+    include = str(root / 'pkg' / 'include')
+    assert flags == ['-I', include, '-I', include, '-D', 'FOO=1', '-U', 'BAR', '-std=c++17']
+
+def test_symlinked_include_outside_the_workspace_is_dropped(tmp_path):
+    root = tmp_path / 'ws'
+    root.mkdir()
+    (root / 'link').symlink_to('/etc')
+    _, flags = _parse_compile_command({"directory": str(root), "file": "a.cpp", "arguments": ["g++", "-Ilink"]}, str(root))
+    assert flags == []
+
+def test_precompiled_header_ignores_workspace_include_paths(tmp_path):
+    root = tmp_path / 'ws'
+    checker = CppSyntaxChecker(include_dirs=[str(root / 'pkg' / 'include')], root_dir=str(root), pch_dir=str(tmp_path))
+    flags = ['-I', str(root / 'other'), '-isystem', '/opt/ros/noetic/include', '-include', '/x.h', '-D', 'FOO', '-std=c++17']
+    assert checker._pch_build_flags(flags + checker.include_flags) == (
+        ['-isystem', '/opt/ros/noetic/include', '-D', 'FOO', '-std=c++17'] + checker.include_flags[2:])
+FAKE_COMPILER = '''#!{python}
+import sys
+import time
+with open({log!r}, 'a') as f:
+    f.write(' '.join(sys.argv[1:]) + '\\n')
+failed = False
+for path in sys.argv[1:]:
+    if path.endswith('nested.cpp'):
+        sys.stderr.write(f"In file included from inc/b.h:1,\\n                 from {{path}}:1:\\n"
+                         "inc/a.h:1:9: error: expected primary-expression\\n")
+    elif path.endswith('stray.cpp'):
+        sys.stderr.write("In file included from elsewhere.cpp:1:\\ninc/a.h:1:9: error: expected primary-expression\\n")
+    elif path.endswith('bad.cpp'):
+        sys.stderr.write(f"{{path}}:2:1: error: expected ';'\\n")
+    else:
+        continue
+    failed = True
+sys.exit(1 if failed else 0)
+'''
+
+def fake_checker(tmp_path):
+    log = tmp_path / 'calls.log'
+    compiler = tmp_path / 'fake-g++'
+    compiler.write_text(FAKE_COMPILER.format(python=sys.executable, log=str(log)))
+    compiler.chmod(0o755)
+    return CppSyntaxChecker(compiler=str(compiler), use_pch=False), log
+
+def test_nested_include_errors_are_attributed_to_their_file(tmp_path):
+    checker, log = fake_checker(tmp_path)
+    paths = [str(tmp_path / name) for name in ('ok.cpp', 'nested.cpp', 'bad.cpp')]
+    results = checker.check_many(paths)
+    assert {os.path.basename(path): ok for path, (ok, _) in results.items()} == {
+        'ok.cpp': True, 'nested.cpp': False, 'bad.cpp': False}
+    assert 'from ' + paths[1] in results[paths[1]][1]
+    assert len(log.read_text().splitlines()) == 1
+
+def test_unattributed_errors_fall_back_to_one_run_per_file(tmp_path):
+    checker, log = fake_checker(tmp_path)
+    paths = [str(tmp_path / name) for name in ('ok.cpp', 'stray.cpp', 'bad.cpp')]
+    results = checker.check_many(paths)
+    assert {os.path.basename(path): ok for path, (ok, _) in results.items()} == {
+        'ok.cpp': True, 'stray.cpp': False, 'bad.cpp': False}
+    assert len(log.read_text().splitlines()) == 4
+
+def test_failed_precompiled_header_leaves_no_files_and_is_retried_later(tmp_path):
+    checker = CppSyntaxChecker(compiler='false', pch_dir=str(tmp_path))
+    assert checker._pch_flags(['-std=c++17']) == []
+    header_dir, = [path for path in tmp_path.iterdir()]
+    assert list(header_dir.iterdir()) == []
+    assert cpp_checker._pch_retry_at[str(header_dir)] > time.monotonic()
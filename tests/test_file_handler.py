@@ -0,0 +1,83 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from backend.file_handler import iter_workspace_upload, handle_workspace_upload, UploadRejected
+
+def make_zip(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+def extract(archive, temp_dir, **limits):
+    return list(iter_workspace_upload(archive, str(temp_dir), **limits))
+
+def test_extracts_sources_after_package_files(tmp_path):
+    archive = make_zip({
+        'ws/pkg/src/node.py': 'import rospy\n',
+        'ws/pkg/package.xml': '<package/>',
+        'ws/pkg/include/pkg/util.h': '#pragma once\n',
+        'ws/pkg/README.md': 'skipped',
+    })
+    paths = extract(archive, tmp_path)
+    assert paths == [os.path.join(str(tmp_path), 'ws', 'pkg', 'src', 'node.py')]
+    # Package files and headers are already on disk when the first source is yielded
+    assert (tmp_path / 'ws' / 'pkg' / 'package.xml').exists()
+    assert (tmp_path / 'ws' / 'pkg' / 'include' / 'pkg' / 'util.h').exists()
+    assert not (tmp_path / 'ws' / 'pkg' / 'README.md').exists()
+
+@pytest.mark.parametrize('name', ['../evil.py', 'pkg/../../evil.py', '/abs/evil.py', 'C:/evil.py', '..\\evil.py'])
+def test_rejects_path_traversal(tmp_path, name):
+    with pytest.raises(UploadRejected) as excinfo:
+        extract(make_zip({name: 'x'}), tmp_path / 'out')
+    assert excinfo.value.status_code == 400
+    assert not (tmp_path / 'evil.py').exists()
+
+def test_rejects_too_many_entries(tmp_path):
+    archive = make_zip({f'pkg/n{i}.py': '' for i in range(6)})
+    with pytest.raises(UploadRejected) as excinfo:
+        extract(archive, tmp_path, max_entries=5)
+    assert excinfo.value.status_code == 413
+
+def test_rejects_large_entry(tmp_path):
+    archive = make_zip({'pkg/big.py': 'x' * 2048})
+    with pytest.raises(UploadRejected) as excinfo:
+        extract(archive, tmp_path, max_entry_size=1024)
+    assert excinfo.value.status_code == 413
+
+def test_rejects_entry_with_wrong_declared_size(tmp_path):
+    archive = make_zip({'pkg/bomb.py': 'x' * 4096})
+    # Understate the uncompressed size in the central directory, as a zip bomb would
+    data = archive.getvalue()
+    size_offset = data.rfind(b'PK\x01\x02') + 24
+    patched = data[:size_offset] + (16).to_bytes(4, 'little') + data[size_offset + 4:]
+    with pytest.raises(UploadRejected) as excinfo:
+        extract(io.BytesIO(patched), tmp_path, max_entry_size=1024)
+    assert excinfo.value.status_code == 400
+
+def test_rejects_large_total_size(tmp_path):
+    archive = make_zip({f'pkg/n{i}.py': 'x' * 600 for i in range(3)})
+    with pytest.raises(UploadRejected) as excinfo:
+        extract(archive, tmp_path, max_total_size=1500)
+    assert excinfo.value.status_code == 413
+
+def test_rejects_colliding_paths(tmp_path):
+    archive = make_zip({'inc/a.h': 'x', 'inc/a.h/b.py': 'y'})
+    with pytest.raises(UploadRejected) as excinfo:
+        extract(archive, tmp_path)
+    assert excinfo.value.status_code == 400
+
+def test_rejects_invalid_archive():
+    with pytest.raises(UploadRejected):
+        handle_workspace_upload(io.BytesIO(b'not a zip'))
+
+def test_workspace_upload_cleans_up_on_rejection(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+    with pytest.raises(UploadRejected):
+        handle_workspace_upload(make_zip({'../evil.py': 'x'}))
+    assert list(tmp_path.iterdir()) == []
\ No newline at end of file
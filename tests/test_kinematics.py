@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.kinematics import dh_model, load_model, load_urdf, rpy_transform, rotation_x, rotation_z, translation
+
+def naive_dh(params, q, convention='standard'):
+    """Tool frame of a DH chain, multiplying one joint at a time"""
+    transform = np.eye(4)
+    for row, angle in zip(params, q):
+        theta = row.get('theta', 0.0)
+        d = row.get('d', 0.0)
+        if row.get('type') == 'prismatic':
+            d += angle
+        else:
+            theta += angle
+        if convention == 'standard':
+            link = rotation_z(theta) @ translation((0, 0, d)) @ translation((row.get('a', 0.0), 0, 0)) @ rotation_x(row.get('alpha', 0.0))
+        else:
+            link = rotation_x(row.get('alpha', 0.0)) @ translation((row.get('a', 0.0), 0, 0)) @ rotation_z(theta) @ translation((0, 0, d))
+        transform = transform @ link
+    return transform
+
+UR5 = [
+    {"d": 0.089, "alpha": np.pi / 2},
+    {"a": -0.425},
+    {"a": -0.392},
+    {"d": 0.109, "alpha": np.pi / 2},
+    {"d": 0.095, "alpha": -np.pi / 2, "theta": 0.3},
+    {"d": 0.082},
+]
+
+MIXED = [
+    {"a": 0.2, "alpha": 0.4, "d": 0.1},
+    {"type": "prismatic", "alpha": -1.2, "theta": 0.5},
+    {"a": 0.3, "d": -0.05, "alpha": 0.9},
+]
+
+@pytest.mark.parametrize('params', [UR5, MIXED])
+@pytest.mark.parametrize('convention', ['standard', 'modified'])
+def test_forward_matches_naive_dh_chain(params, convention):
+    model = dh_model('arm', params, convention)
+    q = np.random.default_rng(0).uniform(-np.pi, np.pi, (50, len(params)))
+    frames = model.forward(q)
+    assert frames.shape == (50, len(params) + 1, 4, 4)
+    for i in range(len(q)):
+        np.testing.assert_allclose(frames[i, -1], naive_dh(params, q[i], convention), atol=1e-12)
+        # Frame 2 is joint 3's frame before it moves; with the modified convention that
+        # already includes joint 3's own link transform
+        if convention == 'standard':
+            expected = naive_dh(params[:2], q[i, :2], convention)
+        else:
+            expected = naive_dh(params[:3], [q[i, 0], q[i, 1], 0.0], convention)
+        np.testing.assert_allclose(frames[i, 2], expected, atol=1e-12)
+
+def test_base_and_tool_frames():
+    base, tool = rpy_transform((0.1, 0, 0.5), (0, 0, np.pi / 2)), translation((0, 0, 0.1))
+    model = dh_model('arm', UR5, base=base, tool=tool)
+    q = np.full((1, 6), 0.2)
+    np.testing.assert_allclose(model.end_effector(q)[0], base @ naive_dh(UR5, q[0]) @ tool, atol=1e-12)
+
+def test_link_scale_scales_offsets():
+    model = dh_model('planar', [{"a": 0.3}, {"a": 0.3}])
+    q = np.array([[0.0, np.pi / 2], [0.0, 0.0]])
+    np.testing.assert_allclose(model.positions(q)[:, -1], [[0.3, 0.3, 0.0], [0.6, 0.0, 0.0]], atol=1e-12)
+    np.testing.assert_allclose(model.positions(q, np.array([2.0, 0.5]))[:, -1], [[0.6, 0.6, 0.0], [0.3, 0.0, 0.0]], atol=1e-12)
+
+def test_joint_values_pad_and_clamp():
+    model = dh_model('arm', [{"limits": [-1, 1]}, {}, {"type": "prismatic", "limits": [0, 0.2]}])
+    q = model.joint_values([[2.0, 5.0, -0.5, 9.0]])
+    np.testing.assert_allclose(q, [[1.0, 5.0, 0.0]])
+    np.testing.assert_allclose(model.joint_values([[2.0]], clamp=False), [[2.0, 0.0, 0.0]])
+    
+    violations = model.limit_violations([[2.0, 0.0, 0.1], [0.5, 0.0, 0.1]], ['joint1', 'joint2', 'joint3'])
+    assert violations == [{"joint": 'joint1', "model_joint": 'joint1', "min": 0.5, "max": 2.0,
+                           "lower": -1.0, "upper": 1.0}]
+
+def test_urdf_chain_matches_manual_transforms(tmp_path):
+    path = tmp_path / 'arm.urdf'
+    path.write_text("""<robot name="test_arm">
+      <link name="world"/><link name="base"/><link name="l1"/><link name="l2"/><link name="tool"/><link name="cam"/>
+      <joint name="fix" type="fixed"><parent link="world"/><child link="base"/><origin xyz="0 0 0.1"/></joint>
+      <joint name="j1" type="revolute"><parent link="base"/><child link="l1"/><origin xyz="0 0 0.2"/>
+        <axis xyz="0 0 1"/><limit lower="-3" upper="3"/></joint>
+      <joint name="j2" type="revolute"><parent link="l1"/><child link="l2"/><origin xyz="0.3 0 0"/><axis xyz="0 1 0"/></joint>
+      <joint name="j3" type="prismatic"><parent link="l2"/><child link="tool"/><origin xyz="0.3 0 0" rpy="0.1 0.2 0.3"/>
+        <axis xyz="1 0 0"/></joint>
+      <joint name="camj" type="fixed"><parent link="l1"/><child link="cam"/></joint>
+    </robot>""")
+    model = load_urdf(str(path))
+    assert model.name == 'test_arm'
+    assert model.joint_names == ['j1', 'j2', 'j3']
+    np.testing.assert_allclose(model.lower, [-3, -np.inf, -np.inf])
+    
+    q = np.array([0.7, -0.4, 0.05])
+    rotation_y = np.eye(4)
+    rotation_y[[0, 0, 2, 2], [0, 2, 0, 2]] = [np.cos(q[1]), np.sin(q[1]), -np.sin(q[1]), np.cos(q[1])]
+    expected = (translation((0, 0, 0.1)) @ translation((0, 0, 0.2)) @ rotation_z(q[0])
+                @ translation((0.3, 0, 0)) @ rotation_y
+                @ rpy_transform((0.3, 0, 0), (0.1, 0.2, 0.3)) @ translation((q[2], 0, 0)))
+    np.testing.assert_allclose(model.end_effector(q)[0], expected, atol=1e-12)
+
+def test_load_model_caches_until_file_changes(tmp_path):
+    path = tmp_path / 'arm.json'
+    path.write_text(json.dumps({"name": "one", "joints": [{"a": 0.3}]}))
+    first = load_model(str(path))
+    assert load_model(str(path)) is first
+    path.write_text(json.dumps({"name": "two", "joints": [{"a": 0.3}, {"a": 0.2}]}))
+    second = load_model(str(path))
+    assert second.name == 'two' and second.dof == 2
+    assert second.fingerprint != first.fingerprint
+
+@pytest.mark.parametrize('content', ['{"joints": [{"a": 1}]', '{"name": "x"}', '{"joints": []}',
+                                     '{"joints": [{"type": "ball"}]}', '{"convention": "other", "joints": [{}]}'])
+def test_invalid_dh_files(tmp_path, content):
+    path = tmp_path / 'bad.json'
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_model(str(path))
\ No newline at end of file
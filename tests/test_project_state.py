@@ -0,0 +1,65 @@
+import os
+
+from backend import workspace_checker
+from backend.result_cache import ResultCache
+from backend.project_state import ProjectState, check_workspace_incremental
+
+WORKSPACE = {
+    'pkg/package.xml': '<package><name>pkg</name></package>\n',
+    'pkg/include/pkg/shared.h': '#pragma once\n#include "pkg/util.h"\nint shared();\n',
+    'pkg/include/pkg/util.h': '#pragma once\nint util();\n',
+    'pkg/src/a.cpp': '#include "pkg/shared.h"\nint main() { return shared(); }\n',
+    'pkg/src/b.cpp': '#include <pkg/shared.h>\nint b() { return util(); }\n',
+    'pkg/src/c.cpp': 'int c() { return 0; }\n',
+    'pkg/scripts/talker.py': 'import rospy\nrospy.init_node("talker")\n',
+}
+
+def write_workspace(root, files):
+    for rel_path, content in files.items():
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+def source_paths(root):
+    return sorted(os.path.join(root, rel_path) for rel_path in WORKSPACE if rel_path.endswith(('.py', '.cpp')))
+
+def recheck(root, state, monkeypatch):
+    """Check the workspace again, returning the report and the files actually analyzed"""
+    checked = []
+    check_single_file = workspace_checker._check_single_file
+    
+    def recording_check(path, *args):
+        checked.append(os.path.relpath(path, root).replace(os.sep, '/'))
+        return check_single_file(path, *args)
+    
+    monkeypatch.setattr(workspace_checker, '_check_single_file', recording_check)
+    report = check_workspace_incremental(source_paths(root), root, 'ws', state, max_workers=1)
+    return report, sorted(checked)
+
+def test_editing_a_file_rechecks_only_that_file(tmp_path, monkeypatch):
+    root = str(tmp_path / 'ws')
+    write_workspace(root, WORKSPACE)
+    state = ProjectState(ResultCache(str(tmp_path / 'cache')))
+    report, checked = recheck(root, state, monkeypatch)
+    assert len(checked) == 4
+    
+    write_workspace(root, {'pkg/scripts/talker.py': 'import rospy\nrospy.init_node("talker2")\n'})
+    report, checked = recheck(root, state, monkeypatch)
+    assert checked == ['pkg/scripts/talker.py']
+    assert report["incremental"] == {"project": 'ws', "files": 4, "rechecked": 1, "reused": 3}
+    
+    report, checked = recheck(root, state, monkeypatch)
+    assert checked == []
+
+def test_editing_a_header_rechecks_every_file_that_includes_it(tmp_path, monkeypatch):
+    root = str(tmp_path / 'ws')
+    write_workspace(root, WORKSPACE)
+    state = ProjectState(ResultCache(str(tmp_path / 'cache')))
+    recheck(root, state, monkeypatch)
+    
+    # util.h is included by a.cpp and b.cpp through shared.h
+    write_workspace(root, {'pkg/include/pkg/util.h': '#pragma once\nint util();\nint util2();\n'})
+    report, checked = recheck(root, state, monkeypatch)
+    assert checked == ['pkg/src/a.cpp', 'pkg/src/b.cpp']
+    assert report["incremental"]["rechecked"] == 2
\ No newline at end of file
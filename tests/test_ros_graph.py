@@ -0,0 +1,33 @@
+from backend.ros_graph import ROSGraph
+
+def elements(publishers=(), subscribers=(), services=()):
+    return {"publishers": [{"topic": topic} for topic in publishers],
+            "subscribers": list(subscribers),
+            "services": [{"service": service} for service in services]}
+
+def test_subscription_nobody_publishes():
+    graph = ROSGraph()
+    graph.update_file('listener.py', elements(subscribers=['chatter']))
+    assert graph.issues() == ["Topic /chatter is subscribed to in listener.py but never published"]
+
+def test_published_topic_without_subscribers():
+    graph = ROSGraph()
+    graph.update_file('talker.cpp', elements(publishers=['/chatter']))
+    assert graph.issues() == ["Topic /chatter is published in talker.cpp but has no subscribers"]
+
+def test_service_advertised_twice():
+    graph = ROSGraph()
+    graph.update_file('a.py', elements(services=['reset']))
+    assert graph.issues() == []
+    graph.update_file('b.cpp', elements(services=['/reset']))
+    assert graph.issues() == ["Service /reset is advertised more than once: a.py, b.cpp"]
+
+def test_topics_are_linked_across_files_and_relinked_on_change():
+    graph = ROSGraph()
+    assert graph.sync({'talker.py': elements(publishers=['chatter']),
+                       'listener.cpp': elements(subscribers=['/chatter'])}) == 2
+    assert graph.issues() == []
+    assert graph.to_dict()["topics"] == {"/chatter": {"publishers": ['talker.py'], "subscribers": ['listener.cpp']}}
+    
+    assert graph.sync({'listener.cpp': elements(subscribers=['/chatter'])}) == 1
+    assert graph.issues() == ["Topic /chatter is subscribed to in listener.cpp but never published"]
\ No newline at end of file
@@ -0,0 +1,133 @@
+import ast
+import textwrap
+import time
+
+import pytest
+
+from backend.safety_rules import (SafetyRule, check_python, check_cpp, register_rule, registered_rules,
+                                  tokenize_cpp, MAX_FINDINGS_PER_RULE)
+
+def python_findings(source):
+    return check_python(ast.parse(textwrap.dedent(source)))
+
+def rules_of(findings):
+    return [(finding['rule'], finding['line']) for finding in findings]
+
+def test_python_busy_loop_without_sleep():
+    findings = python_findings("""
+        import rospy
+        while not rospy.is_shutdown():
+            pub.publish(msg)
+    """)
+    assert rules_of(findings) == [('busy-loop', 3)]
+    assert findings[0]['severity'] == 'warning'
+
+@pytest.mark.parametrize('body', ['rate.sleep()', 'rospy.spin()', 'break'])
+def test_python_loop_that_sleeps_or_breaks(body):
+    assert python_findings(f"""
+        while True:
+            pub.publish(msg)
+            {body}
+    """) == []
+
+def test_python_inner_sleep_throttles_outer_loop():
+    assert python_findings("""
+        while True:
+            for i in range(3):
+                time.sleep(0.1)
+    """) == []
+
+def test_python_sleep_in_nested_function_does_not_count():
+    findings = python_findings("""
+        while True:
+            def callback(msg):
+                time.sleep(1)
+    """)
+    assert rules_of(findings) == [('busy-loop', 2)]
+
+def test_python_break_in_inner_loop_does_not_end_outer_loop():
+    findings = python_findings("""
+        while True:
+            for item in items:
+                break
+    """)
+    assert rules_of(findings) == [('busy-loop', 2)]
+
+def test_python_publisher_queue_size():
+    findings = python_findings("""
+        a = rospy.Publisher('chatter', String)
+        b = rospy.Publisher('chatter', String, queue_size=10)
+        c = rospy.Publisher('chatter', String, **options)
+    """)
+    assert rules_of(findings) == [('publisher-queue-size', 2)]
+    assert findings[0]['severity'] == 'info'
+
+@pytest.mark.parametrize('loop', ['while (ros::ok())', 'while (true)', 'for (;;)', 'while (1)'])
+def test_cpp_busy_loop(loop):
+    findings = check_cpp(f"int main() {{\n  {loop} {{\n    pub.publish(msg);\n  }}\n}}\n")
+    assert rules_of(findings) == [('busy-loop', 2)]
+
+@pytest.mark.parametrize('body', ['rate.sleep();', 'ros::spinOnce(); usleep(100);', 'if (done) { break; }'])
+def test_cpp_loop_that_sleeps_or_breaks(body):
+    assert check_cpp(f"int main() {{ while (ros::ok()) {{ {body} }} }}") == []
+
+def test_cpp_break_inside_switch_does_not_leave_loop():
+    findings = check_cpp("int main() { while (ros::ok()) { switch (x) { case 1: break; } } }")
+    assert rules_of(findings) == [('busy-loop', 1)]
+    assert check_cpp("int main() { while (ros::ok()) { switch (x) { case 1: { break; } } if (y) { break; } } }") == []
+
+def test_cpp_bounded_loop_is_not_flagged():
+    assert check_cpp("int main() { while (count < 10) { count++; } }") == []
+
+@pytest.mark.parametrize('source', ['int main() { do { pub.publish(msg); } while (ros::ok()); }',
+                                    'int main() { while (true) pub.publish(msg); }',
+                                    'int main() { while (true); }'])
+def test_cpp_do_and_braceless_busy_loops(source):
+    assert rules_of(check_cpp(source)) == [('busy-loop', 1)]
+
+@pytest.mark.parametrize('source', ['int main() { do { rate.sleep(); } while (true); }',
+                                    'int main() { do { count++; } while (count < 10); }',
+                                    'int main() { while (true) if (done) break; }',
+                                    'int main() { for (int i = 0; i < 3; i++) count++; while (true) rate.sleep(); }'])
+def test_cpp_do_and_braceless_loops_that_end(source):
+    assert check_cpp(source) == []
+
+def test_cpp_deep_nesting_stays_linear():
+    n = 20000
+    source = 'void f() { while (true) {' + '{' * n + 'break;' * n + '}' * n + '} }'
+    start = time.perf_counter()
+    assert check_cpp(source) == []
+    assert time.perf_counter() - start < 5
+
+def test_cpp_comments_and_strings_are_skipped():
+    source = '// while (true) { }\nconst char* s = "while (true) {";\n/* sleep */\n#include <ros/ros.h>\n'
+    assert [token.text for token in tokenize_cpp(source)] == ['const', 'char', '*', 's', '=',
+                                                              '"while (true) {"', ';']
+    assert check_cpp(source) == []
+
+def test_findings_per_rule_are_capped():
+    source = "\n".join("while True:\n    pass" for _ in range(MAX_FINDINGS_PER_RULE + 10))
+    assert len(check_python(ast.parse(source))) == MAX_FINDINGS_PER_RULE
+
+def test_custom_rule():
+    class GlobalRule(SafetyRule):
+        name = 'no-global'
+        severity = 'error'
+        message = "global statement"
+        node_types = (ast.Global,)
+        
+        def enter(self, node, context):
+            self.report(node.lineno)
+    
+    findings = check_python(ast.parse("def f():\n    global x\n"), [GlobalRule])
+    assert findings == [{"rule": 'no-global', "severity": 'error', "line": 2, "message": "global statement"}]
+    assert GlobalRule not in registered_rules('python')
+
+def test_register_rule_rejects_unknown_severity():
+    class BadRule(SafetyRule):
+        name = 'bad'
+        severity = 'fatal'
+    
+    with pytest.raises(ValueError):
+        register_rule(BadRule)
+    assert BadRule not in registered_rules('python')
\ No newline at end of file